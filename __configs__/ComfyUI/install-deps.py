@@ -1,13 +1,24 @@
 """ install-deps.py | by ANXETY """
 
-from importlib.metadata import distribution, PackageNotFoundError
+from importlib.metadata import distributions
 from pathlib import Path
 import subprocess
 import importlib
+import hashlib
+import json
 import sys
 import re
 import os
 
+try:
+    from packaging.requirements import Requirement, InvalidRequirement
+    from packaging.version import Version, InvalidVersion
+    from packaging.utils import canonicalize_name
+except ImportError:    # pip always vendors packaging
+    from pip._vendor.packaging.requirements import Requirement, InvalidRequirement
+    from pip._vendor.packaging.version import Version, InvalidVersion
+    from pip._vendor.packaging.utils import canonicalize_name
+
 def get_enabled_subdirectories(base_directory):
     """Find active directories with dependencies"""
     base_path = Path(base_directory)
@@ -15,14 +26,12 @@ def get_enabled_subdirectories(base_directory):
 
     for subdir in base_path.iterdir():
         if subdir.is_dir() and not subdir.name.endswith('.disabled') and not subdir.name.startswith('.') and subdir.name != '__pycache__':
-            print(f"\033[1;34mChecking dependencies >> \033[0m{subdir.name}")
             req_file = subdir / 'requirements.txt'
             inst_script = subdir / 'install.py'
 
             if req_file.exists() or inst_script.exists():
                 subdirs.append((subdir, req_file, inst_script))
 
-    print()
     return subdirs
 
 def get_git_package_name(git_url):
@@ -60,127 +69,215 @@ def is_git_installed(git_url):
             continue
     return False
 
-def check_package(package_spec):
-    """Check package installation with version verification"""
-    try:
-        if 'git+' in package_spec:
-            return is_git_installed(package_spec)
-
-        match = re.match(r'^([^=><]+)([<>=!]+)(.+)$', package_spec)
-        if not match:
-            dist = distribution(package_spec.strip())
-            return True
+def split_option(line):
+    """'--index-url=URL' / '-i URL' -> ('--index-url' / '-i', 'URL')"""
+    parts = re.split(r'[=\s]\s*', line, maxsplit=1)
+    return parts[0], parts[1] if len(parts) > 1 else ''
+
+def local_path(value, base_dir):
+    """Resolve a relative path from a requirements file; URLs are returned unchanged"""
+    if '://' in value or value.startswith('git+'):
+        return value
+    return str((base_dir / value).resolve())
+
+def parse_requirements(file_path, options, seen_files=None):
+    """
+    Parse a requirements file into Requirement objects (recursing into `-r` includes).
+    Editable installs are kept as '-e <target>' strings; other option lines go to `options`
+    """
+    seen_files = seen_files if seen_files is not None else set()
+    file_path = file_path.resolve()
+    if not file_path.exists() or file_path in seen_files:
+        return []
+    seen_files.add(file_path)
+
+    requirements = []
+    with open(file_path) as f:
+        for line in f:
+            line = line.split(' #')[0].strip()
+            if not line or line.startswith('#'):
+                continue
 
-        name, op, version = map(str.strip, match.groups())
-        installed = distribution(name).version
-        return compare_versions(installed, version, op)
+            if line.startswith(('-r ', '--requirement ')):
+                include = file_path.parent / line.split(maxsplit=1)[1]
+                requirements += parse_requirements(include, options, seen_files)
+            elif line.startswith(('-e', '--editable')):
+                requirements.append(f"-e {local_path(split_option(line)[1], file_path.parent)}")
+            elif line.startswith(('-c', '--constraint')):
+                options.add(f"-c {local_path(split_option(line)[1], file_path.parent)}")
+            elif line.startswith('-'):
+                options.add(line)    # --extra-index-url, --find-links, ...
+            elif 'git+' in line and '@' not in line.split('git+')[0]:
+                requirements.append(line)    # bare VCS URL, checked by import
+            else:
+                try:
+                    requirements.append(Requirement(line))
+                except InvalidRequirement:
+                    print(f"\033[1;31mSkipping invalid requirement >> \033[0m{line} ({file_path.parent.name})")
+    return requirements
+
+def merge_requirements(requirements):
+    """Dedupe by canonical name, intersecting specifiers and uniting extras; drop non-matching markers"""
+    merged = {}
+    for req in requirements:
+        if isinstance(req, str):
+            merged.setdefault(req, req)
+            continue
+        if req.marker and not req.marker.evaluate():
+            continue
 
-    except (PackageNotFoundError, AttributeError):
+        key = canonicalize_name(req.name)
+        if key not in merged:
+            merged[key] = Requirement(str(req))
+            merged[key].marker = None
+        else:
+            current = merged[key]
+            current.specifier &= req.specifier
+            current.extras |= req.extras
+            current.url = current.url or req.url
+    return merged
+
+def installed_snapshot():
+    """One pass over the installed distributions: canonical name -> version"""
+    snapshot = {}
+    for dist in distributions():
+        name = dist.metadata['Name']
+        if name:
+            snapshot.setdefault(canonicalize_name(name), dist.version)
+    return snapshot
+
+def is_satisfied(req, snapshot):
+    if isinstance(req, str):
+        return not req.startswith('-e ') and is_git_installed(req)    # editables are reinstalled
+
+    installed = snapshot.get(canonicalize_name(req.name))
+    if installed is None:
         return False
-
-def compare_versions(v1, v2, operator):
-    """Universal version comparison"""
-    v1_parts = list(map(int, re.findall(r'\d+', v1)))
-    v2_parts = list(map(int, re.findall(r'\d+', v2)))
-
-    for a, b in zip(v1_parts, v2_parts):
-        if a != b:
-            break
-    else:
-        a, b = len(v1_parts), len(v2_parts)
-
-    if operator == '==': return a == b
-    if operator == '>=': return a >= b
-    if operator == '<=': return a <= b
-    if operator == '>': return a > b
-    if operator == '<': return a < b
-    return False
-
-def install_package(package_spec):
-    """Install a package"""
-    print(f"\033[1;32mInstalling >> \033[0m{package_spec}")
-    subprocess.run(
-        [sys.executable, '-m', 'pip', 'install', '-q', package_spec],
-        check=True,
+    if req.url or not req.specifier:
+        return True
+    try:
+        return req.specifier.contains(Version(installed), prereleases=True)
+    except InvalidVersion:
+        return True    # unparsable local version, leave it alone
+
+def pip_install(specs, options):
+    cmd = [sys.executable, '-m', 'pip', 'install', '-q']
+    for spec in specs:
+        cmd += spec.split(maxsplit=1) if spec.startswith('-e ') else [spec]
+    for option in sorted(options):
+        cmd += option.split(maxsplit=1)
+    return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+def install_missing(nodes, options):
+    """
+    Resolve what the nodes sharing one set of pip options are missing with a single pip call.
+    `nodes` maps node names to their parsed requirements; returns the nodes that failed
+    """
+    snapshot = installed_snapshot()
+    merged = merge_requirements([req for requirements in nodes.values() for req in requirements])
+    missing = [str(req) for req in merged.values() if not is_satisfied(req, snapshot)]
+    if not missing:
+        print('\033[1;32mAll requirements are satisfied\033[0m')
+        return set()
+
+    suffix = f" ({' '.join(sorted(options))})" if options else ''
+    print(f"\033[1;32mInstalling >> \033[0m{', '.join(missing)}{suffix}")
+    if pip_install(missing, options).returncode == 0:
+        return set()
+
+    # One conflicting or broken requirement fails the whole resolve: retry each node with its own lines
+    failed = set()
+    for node, requirements in nodes.items():
+        specs = [str(req) for req in requirements
+                 if (isinstance(req, str) or not req.marker or req.marker.evaluate()) and not is_satisfied(req, snapshot)]
+        if not specs:
+            continue
+        result = pip_install(specs, options)
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'pip failed'
+            print(f"\033[1;31mFailed >> \033[0m{node}: {error}")
+            failed.add(node)
+    return failed
+
+def run_install_script(script_path):
+    """Execute installation script; returns True on success"""
+    print(f"\033[1;33mRunning install script >> \033[0m{script_path}")
+    result = subprocess.run(
+        [sys.executable, str(script_path.resolve())],
+        cwd=script_path.parent,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL
     )
+    if result.returncode != 0:
+        print(f"\033[1;31mFailed >> \033[0m{script_path} (exit code {result.returncode})")
+    return result.returncode == 0
+
+def files_hash(paths):
+    """SHA256 over the contents of the given files (order independent)"""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(str(path.name).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def load_state(state_file):
+    """Load per-node content hashes: {node: {'requirements': sha256, 'install': sha256}}"""
+    try:
+        with open(state_file) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
 
-def process_requirements(file_path, installed):
-    """Process requirements file"""
-    if not file_path.exists():
-        return
-
-    with open(file_path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#') or line in installed:
-                continue
-
-            if not check_package(line):
-                install_package(line)
-                installed.add(line)
-
-def run_install_script(script_path, executed):
-    """Execute installation script"""
-    if script_path.exists() and str(script_path) not in executed:
-        print(f"\033[1;33mRunning install script >> \033[0m{script_path}")
-        subprocess.run(
-            [sys.executable, str(script_path)],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        executed.add(str(script_path))
-
-def save_state(installed, scripts, log_file):
-    """Save installation state to log file"""
-    with open(log_file, 'w') as f:
-        f.write('\n'.join(installed))
-        f.write('\n\n# Executed scripts:\n')
-        f.write('\n'.join(scripts))
-
-def load_previous_state(log_file):
-    """Load previous installation state from log"""
-    installed = set()
-    scripts = set()
-
-    if Path(log_file).exists():
-        with open(log_file) as f:
-            section = 0
-            for line in f:
-                line = line.strip()
-                if not line: continue
-
-                if line.startswith('# Executed scripts:'):
-                    section = 1
-                    continue
-
-                if section == 0:
-                    installed.add(line)
-                else:
-                    scripts.add(line)
-
-    return installed, scripts
+def save_state(state, state_file):
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, state_file)
 
 def main():
     base_dir = 'custom_nodes'
-    log_file = 'installed_packages.txt'
+    state_file = 'installed_packages.json'
 
-    installed, executed = load_previous_state(log_file)
+    state = load_state(state_file)
     directories = get_enabled_subdirectories(base_dir)
 
     try:
-        for _, req, script in directories:
-            process_requirements(req, installed)
-            run_install_script(script, executed)
+        # Only nodes whose requirements files changed are re-evaluated;
+        # nodes are installed together per set of pip options (index URLs, constraints, ...)
+        groups = {}     # frozenset(options) -> {node: requirements}
+        pending = {}    # node -> requirements hash
+        for subdir, req, _ in directories:
+            node_options, read_files = set(), set()
+            node_requirements = parse_requirements(req, node_options, read_files)
+            req_hash = files_hash(read_files) if read_files else None
+            if req_hash == state.get(subdir.name, {}).get('requirements'):
+                continue
 
-        save_state(installed, executed, log_file)
+            print(f"\033[1;34mChecking dependencies >> \033[0m{subdir.name}")
+            groups.setdefault(frozenset(node_options), {})[subdir.name] = node_requirements
+            pending[subdir.name] = req_hash
+
+        failed = set()
+        for options, nodes in groups.items():
+            failed |= install_missing(nodes, options)
+        for node, req_hash in pending.items():
+            if node not in failed:
+                state.setdefault(node, {})['requirements'] = req_hash
+
+        # install.py reruns only when its content changed
+        for subdir, _, script in directories:
+            if not script.exists():
+                continue
+            script_hash = files_hash([script])
+            if script_hash != state.get(subdir.name, {}).get('install') and run_install_script(script):
+                state.setdefault(subdir.name, {})['install'] = script_hash
 
     except KeyboardInterrupt:
         print("\n\033[1;31mInterrupted by user\033[0m")
     except Exception as e:
         print(f"\n\033[1;31mError: {e}\033[0m")
+    finally:
+        save_state(state, state_file)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,12 +1,30 @@
 """ CivitAi API Module | by ANXETY """
 
 from urllib.parse import urlparse, parse_qs, urlencode
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
+import threading
 import requests
+import sqlite3
+import random
+import json
+import time
 import os
 
+
+CACHE_PATH = Path.home() / 'ANXETY' / 'cache' / 'civitai.sqlite'
+CACHE_TTL = 24 * 60 * 60    # seconds before a cached response is revalidated
+RESOLVE_WORKERS = 8         # concurrent lookups in resolve_many
+MAX_RETRIES = 4             # attempts on HTTP 429 / 5xx / connection errors
+RETRY_BACKOFF = 1.0         # base delay (sec), doubled per attempt plus jitter
+TIMEOUT = (5, 30)           # connect / read timeout (sec)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+STATS_SIZE = 1000           # latest requests kept for latency_stats
+
 class CivitAiLogger:
     """Provides colored logging functionality for API events"""
 
@@ -22,6 +40,42 @@ class CivitAiLogger:
     def info(message: str):
         print(f"\033[34m[API Info]:\033[0m {message}")
 
+class CivitAiCache:
+    """Persistent API response cache with TTL and ETag revalidation"""
+
+    def __init__(self, path: str | Path = CACHE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'url TEXT PRIMARY KEY, etag TEXT, fetched REAL NOT NULL, body TEXT NOT NULL)'
+        )
+        self.conn.commit()
+
+    def get(self, url: str) -> Optional[Tuple[Optional[str], float, Dict]]:
+        """Return (etag, fetched_at, data) for a cached URL"""
+        with self.lock:
+            row = self.conn.execute('SELECT etag, fetched, body FROM responses WHERE url = ?', (url,)).fetchone()
+        if not row:
+            return None
+        etag, fetched, body = row
+        return etag, fetched, json.loads(body)
+
+    def set(self, url: str, etag: Optional[str], data: Dict):
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO responses (url, etag, fetched, body) VALUES (?, ?, ?, ?)',
+                (url, etag, time.time(), json.dumps(data))
+            )
+            self.conn.commit()
+
+    def touch(self, url: str):
+        """Mark a cached response as fresh after a 304 revalidation"""
+        with self.lock:
+            self.conn.execute('UPDATE responses SET fetched = ? WHERE url = ?', (time.time(), url))
+            self.conn.commit()
+
 @dataclass
 class ModelData:
     """Container for validated model metadata"""
@@ -34,6 +88,8 @@ class ModelData:
     image_url: Optional[str] = None
     image_name: Optional[str] = None
     is_early_access: bool = False
+    sha256: Optional[str] = None
+    size: Optional[int] = None    # bytes, from the primary file's `sizeKB`
 
 class CivitAiAPI:
     """
@@ -46,6 +102,9 @@ class CivitAiAPI:
     - Early access verification
     - Preview image handling
 
+    Responses are kept in an on-disk cache (see CivitAiCache): fresh entries are
+    returned without a request, stale ones are revalidated with If-None-Match.
+
     Usage Example:
         api = CivitAiAPI()
         result = api.validate_download(
@@ -57,26 +116,115 @@ class CivitAiAPI:
     BASE_URL = 'https://civitai.com/api/v1'
     is_KAGGLE = os.getenv('KAGGLE_URL_BASE')    # to check NSFW
 
-    def __init__(self, token: str = None):
-        """Initialize API client with optional authentication token"""
+    def __init__(self, token: str = None, cache_ttl: Optional[float] = CACHE_TTL,
+                 timeout: Tuple[float, float] = TIMEOUT, pool_size: int = RESOLVE_WORKERS):
+        """
+        Initialize API client
+
+        Args:
+            token: Optional authentication token
+            cache_ttl: Seconds a cached response stays fresh (None disables the cache)
+            timeout: (connect, read) timeout for every request
+            pool_size: Keep-alive connections kept per host
+        """
         self.token = token or '65b66176dcf284b266579de57fbdc024'    # FAKE
         self.logger = CivitAiLogger()
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.cache = None
+        if cache_ttl is not None:
+            try:
+                self.cache = CivitAiCache()
+            except sqlite3.Error as e:
+                self.logger.warning(f"Response cache disabled: {e}")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.stats: deque[Tuple[str, float, int]] = deque(maxlen=STATS_SIZE)    # (url, seconds, status)
+        self.stats_lock = threading.Lock()
 
     def _build_url(self, endpoint: str) -> str:
         """Construct full API endpoint URL"""
         return f"{self.BASE_URL}/{endpoint}"
 
     def _fetch_json(self, url: str) -> Optional[Dict]:
-        """Execute GET request and return parsed JSON response"""
+        """Execute GET request and return parsed JSON response (served from cache when fresh)"""
+        cached = self.cache.get(url) if self.cache else None
+        if cached and time.time() - cached[1] < self.cache_ttl:
+            return cached[2]
+
         try:
             headers = {'Authorization': f"Bearer {self.token}"} if self.token else {}
-            response = requests.get(url, headers=headers)
+            if cached and cached[0]:
+                headers['If-None-Match'] = cached[0]
+
+            response = self._get(url, headers)
+            if response.status_code == 304 and cached:
+                self.cache.touch(url)
+                return cached[2]
+
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            if self.cache:
+                self.cache.set(url, response.headers.get('ETag'), data)
+            return data
         except requests.RequestException as e:
+            if cached:
+                self.logger.warning(f"Request to {url} failed, using cached response: {str(e)}")
+                return cached[2]
             self.logger.error(f"Request to {url} failed: {str(e)}")
             return None
 
+    def _get(self, url: str, headers: Dict) -> requests.Response:
+        """GET on the pooled session, retrying 429/5xx and connection errors with jittered backoff"""
+        for attempt in range(MAX_RETRIES):
+            start = time.monotonic()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(url, time.monotonic() - start, 0)
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                time.sleep(RETRY_BACKOFF * 2 ** attempt + random.uniform(0, RETRY_BACKOFF))
+                continue
+
+            self._record(url, time.monotonic() - start, response.status_code)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES - 1:
+                return response
+
+            retry_after = response.headers.get('Retry-After', '')
+            delay = float(retry_after) if retry_after.isdigit() else RETRY_BACKOFF * 2 ** attempt
+            time.sleep(delay + random.uniform(0, RETRY_BACKOFF))
+
+    def _record(self, url: str, seconds: float, status: int):
+        with self.stats_lock:
+            self.stats.append((url, seconds, status))
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize request latency per endpoint over the latest STATS_SIZE requests
+
+        Returns:
+            {'models': {'count': 3, 'total': 1.2, 'avg': 0.4, 'max': 0.6}, 'model-versions': {...}}
+        """
+        summary = {}
+        with self.stats_lock:
+            stats = list(self.stats)
+
+        for url, seconds, _ in stats:
+            endpoint = url.replace(self.BASE_URL, '').strip('/').split('/')[0].split('?')[0]
+            entry = summary.setdefault(endpoint, {'count': 0, 'total': 0.0, 'max': 0.0})
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+
+        for entry in summary.values():
+            entry['avg'] = entry['total'] / entry['count']
+        return summary
+
     def _process_download_url(self, download_url: str) -> Tuple[str, str]:
         """Sanitize download URL and add authentication token"""
         parsed_url = urlparse(download_url)
@@ -155,6 +303,9 @@ class CivitAiAPI:
             )
 
         early_access = data.get('availability') == 'EarlyAccess' or data.get('earlyAccessEndsAt', None)
+        primary = self._primary_file(data)
+        sha256 = primary.get('hashes', {}).get('SHA256')
+        size_kb = primary.get('sizeKB')
 
         return ModelData(
             download_url=full_url,
@@ -165,12 +316,20 @@ class CivitAiAPI:
             model_id=data['modelId'],
             is_early_access=early_access,
             image_url=preview_url,
-            image_name=preview_name
+            image_name=preview_name,
+            sha256=sha256,
+            size=int(size_kb * 1024) if size_kb else None
         )
 
+    @staticmethod
+    def _primary_file(data: Dict) -> Dict:
+        """The file `downloadUrl` serves: the primary one, else the first"""
+        files = data.get('files') or [{}]
+        return next((f for f in files if f.get('primary')), files[0])
+
     def _determine_model_name(self, data: Dict, custom_name: Optional[str]) -> Tuple[str, str]:
         """Generate final model filename with proper extension"""
-        original_name = data['files'][0]['name']
+        original_name = self._primary_file(data)['name']
         original_extension = original_name.split('.')[-1]
 
         if custom_name:
@@ -214,6 +373,26 @@ class CivitAiAPI:
 
         return model_info
 
+    def resolve_many(self, urls: List[str], file_names: Optional[List[Optional[str]]] = None,
+                     max_workers: int = RESOLVE_WORKERS) -> List[Optional[ModelData]]:
+        """
+        Validate many model URLs concurrently over the pooled session
+
+        Args:
+            urls: CivitAI model URLs in any supported format
+            file_names: Optional custom filenames, aligned with `urls`
+            max_workers: Maximum number of concurrent lookups
+
+        Returns:
+            ModelData (or None on failure) for every URL, in input order
+        """
+        if not urls:
+            return []
+        file_names = file_names or [None] * len(urls)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.validate_download, urls, file_names))
+
     def get_data(self, url: str) -> Optional[Dict]:
         """Get Full Model Version metadata"""
         return self._get_version_data(url)
\ No newline at end of file
@@ -1,28 +1,51 @@
 """ Manager Module | by ANXETY """
 
-from CivitaiAPI import CivitAiAPI    # CivitAI API
-import json_utils as js              # JSON
+from download_engine import RangeDownloader, DownloadError, cancel_all    # Native Downloader
+from stage_runner import child_pids, terminate_children                   # Child Processes
+from CivitaiAPI import CivitAiAPI                                         # CivitAI API
+import json_utils as js                                                   # JSON
 
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
+from dataclasses import dataclass
+from typing import Optional
 from pathlib import Path
 import subprocess
+import threading
 import requests
 import zipfile
+import shutil
 import shlex
 import sys
 import os
 import re
 
 
-CD = os.chdir
-
 # Constants
 HOME = Path.home()
 SCR_PATH = Path(HOME / 'ANXETY')
 SETTINGS_PATH = SCR_PATH / 'settings.json'
 
-CAI_TOKEN = js.read(SETTINGS_PATH, 'WIDGETS.civitai_token') or '65b66176dcf284b266579de57fbdc024'
-HF_TOKEN = js.read(SETTINGS_PATH, 'WIDGETS.huggingface_token') or ''
+CAI_TOKEN, HF_TOKEN = js.read_many(SETTINGS_PATH, ['WIDGETS.civitai_token', 'WIDGETS.huggingface_token'])
+CAI_TOKEN = CAI_TOKEN or '65b66176dcf284b266579de57fbdc024'
+HF_TOKEN = HF_TOKEN or ''
+
+# Download concurrency limits
+MAX_WORKERS = 4     # simultaneous downloads
+MAX_PER_HOST = 2    # simultaneous downloads per host
+MAX_GIT_WORKERS = 8 # simultaneous git clones / updates
+MAX_PROBE_WORKERS = 8   # simultaneous HEAD requests for file sizes
+
+MIN_FREE_MB = 512   # disk space kept free on top of the planned downloads
+REMOTE_FS_TYPES = ('fuse', 'nfs', 'cifs', 'smb', '9p')    # no preallocation on these
+
+# Download engine per host: 'native' (in-process range requests) or 'aria2'
+# Hosts not listed here keep using aria2c / curl / gdown
+DOWNLOAD_ENGINES = js.read(SETTINGS_PATH, 'DOWNLOAD.engines') or {
+    'huggingface.co': 'native'
+}
+
+PRINT_LOCK = threading.Lock()
 
 
 ## ====================== Download =======================
@@ -44,46 +67,196 @@ def handle_errors(func):
 
 # Download function
 @handle_errors
-def m_download(line, log=False, unzip=False):
-    """Download files from a comma-separated list of URLs or file paths."""
+def m_download(line, log=False, unzip=False, max_workers=MAX_WORKERS, per_host=MAX_PER_HOST, sizes=None, hashes=None):
+    """
+    Download files from a comma-separated list of URLs or file paths.
+    `sizes` maps URLs to known sizes in bytes; the rest are probed with HEAD requests.
+    `hashes` maps URLs to expected SHA256 digests that the finished files are verified against.
+    Returns {url: True if the download finished}; jobs skipped for lack of disk space count as failed.
+    """
     links = [link.strip() for link in line.split(',') if link.strip()]
 
     if not links:
         log_message('> Missing URL, downloading nothing', log)
-        return
+        return {}
 
+    jobs = []
     for link in links:
-        url = link[0]
+        url = link.split()[0]
         if url.endswith('.txt') and Path(url).expanduser().is_file():
             with open(Path(url).expanduser(), 'r') as file:
-                for line in file:
-                    process_download(line, log, unzip)
+                jobs.extend(parse_download_line(file_line) for file_line in file if file_line.strip())
         else:
-            process_download(link, log, unzip)
-
-@handle_errors
-def process_download(line, log, unzip):
-    """Process an individual download line."""
+            jobs.append(parse_download_line(link))
+
+    jobs = [job for job in jobs if job]
+    for job in jobs:
+        job.sha256 = (hashes or {}).get(job.url)
+    planned = plan_downloads(jobs, probe_sizes([job.url for job in jobs], sizes))
+
+    scheduler = DownloadScheduler(max_workers, per_host)
+    finished = scheduler.run(planned, log, unzip)
+
+    results = dict.fromkeys((job.url for job in jobs), False)
+    results.update((job.url, ok) for job, ok in zip(planned, finished))
+    return results
+
+@dataclass
+class DownloadJob:
+    """A parsed download line with an explicit output directory"""
+    url: str
+    path: Path
+    filename: Optional[str]
+    host: str
+    sha256: Optional[str] = None
+
+def parse_download_line(line):
+    """Parse a download line into a job, resolving the output directory up front."""
     parts = line.split()
-    url = parts[0].replace('\\', '')
-    url = clean_url(url)
-
-    if not url:
-        return
+    if not parts:
+        return None
 
+    url = parts[0].replace('\\', '')
     path, filename = handle_path_and_filename(parts, url)
-    current_dir = Path.cwd()
+    return DownloadJob(url, path or Path.cwd(), filename, urlparse(url).netloc)
+
+class DownloadScheduler:
+    """Run download jobs in a bounded worker pool with a global and a per-host limit"""
+
+    def __init__(self, max_workers=MAX_WORKERS, per_host=MAX_PER_HOST):
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self._cond = threading.Condition()
+        self._active = {}    # host -> running jobs
+
+    def _next_job(self, pending):
+        """Pop the first pending job whose host still has a free slot."""
+        for i, job in enumerate(pending):
+            if self._active.get(job.host, 0) < self.per_host:
+                del pending[i]
+                return job
+        return None
 
+    def _release(self, job):
+        with self._cond:
+            self._active[job.host] -= 1
+            self._cond.notify_all()
+
+    def run(self, jobs, log=False, unzip=False):
+        """
+        Dispatch jobs as slots free up and wait until all of them are finished.
+        Returns whether each job succeeded, in order.
+        Ctrl-C drops the queued jobs, stops native downloads and terminates running aria2c / curl processes.
+        """
+        pending = list(jobs)
+        known_children = child_pids()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = []
+            while pending:
+                with self._cond:
+                    while sum(self._active.values()) >= self.max_workers or not (job := self._next_job(pending)):
+                        self._cond.wait()
+                    self._active[job.host] = self._active.get(job.host, 0) + 1
+
+                future = executor.submit(process_download, job, log, unzip)
+                future.add_done_callback(lambda _, job=job: self._release(job))
+                futures.append(future)
+
+            results = [bool(future.result()) for future in futures]
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            cancel_all()
+            terminate_children(known_children)
+            raise
+        executor.shutdown()
+        return results
+
+# Pre-flight size check
+
+def remote_size(url):
+    """Return the size of a URL from a HEAD request, or None if unknown."""
+    if 'drive.google.com' in url or 'civitai.com/models/' in url:
+        return None    # needs a page / API lookup first
+
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    if HF_TOKEN and 'huggingface.co' in url:
+        headers['Authorization'] = f"Bearer {HF_TOKEN}"
+    try:
+        response = requests.head(url, headers=headers, allow_redirects=True, timeout=10)
+        size = int(response.headers.get('content-length', 0))
+        return size if response.ok and size else None
+    except (requests.RequestException, ValueError):
+        return None
+
+def probe_sizes(urls, known=None, max_workers=MAX_PROBE_WORKERS):
+    """Map every URL to its size in bytes (or None), probing only those not in `known`."""
+    sizes = dict(known or {})
+    missing = [url for url in dict.fromkeys(urls) if url not in sizes]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            sizes.update(zip(missing, executor.map(remote_size, missing)))
+    return sizes
+
+def _reserved_bytes(job):
+    """Disk space already held by a resumable aria2 download of the job."""
+    if not job.filename:
+        return 0
+    target = job.path / job.filename
+    if not Path(f"{target}.aria2").exists():
+        return 0
     try:
-        if path:
-            path.mkdir(parents=True, exist_ok=True)
-            CD(path)
+        return target.stat().st_blocks * 512
+    except OSError:
+        return 0
+
+def plan_downloads(jobs, sizes):
+    """
+    Check the planned downloads against the free space of their disks before any bytes move.
+    If they do not all fit, jobs are admitted smallest first, the rest are rejected
+    and jobs of unknown size are kept but moved last.
+    """
+    known = [(sizes[job.url], job) for job in jobs if sizes.get(job.url)]
+    unknown = [job for job in jobs if not sizes.get(job.url)]
+
+    free = {}    # st_dev -> bytes still available
+    needs = []
+    for size, job in known:
+        job.path.mkdir(parents=True, exist_ok=True)
+        device = job.path.stat().st_dev
+        if device not in free:
+            free[device] = shutil.disk_usage(job.path).free - MIN_FREE_MB * 1024**2
+        needs.append((max(size - _reserved_bytes(job), 0), device, job))
+
+    demand = {}
+    for need, device, _ in needs:
+        demand[device] = demand.get(device, 0) + need
+    if all(demand[device] <= free[device] for device in demand):
+        return jobs
+
+    accepted = []
+    for need, device, job in sorted(needs, key=lambda n: n[0]):
+        if need <= free[device]:
+            free[device] -= need
+            accepted.append(job)
+        else:
+            name = job.filename or get_file_name(job.url) or job.url
+            log_message(f"> \033[31m[Disk]:\033[0m Skipping {name}: needs {need / 1024**3:.2f} GB, "
+                        f"only {max(free[device], 0) / 1024**3:.2f} GB free", True)
+    return accepted + unknown
 
-        download_file(url, filename, log)
-        if unzip and filename and filename.endswith('.zip'):
-            unzip_file(filename, log)
-    finally:
-        CD(current_dir)
+@handle_errors
+def process_download(job, log, unzip):
+    """Process an individual download job. Returns True if the file was downloaded."""
+    url = clean_url(job.url)
+    if not url:
+        return False
+
+    job.path.mkdir(parents=True, exist_ok=True)
+    ok = download_file(url, job.path, job.filename, log, job.sha256)
+    if ok and unzip and job.filename and job.filename.endswith('.zip'):
+        unzip_file(job.path / job.filename, log)
+    return bool(ok)
 
 def handle_path_and_filename(parts, url):
     """Extract path and filename from parts."""
@@ -108,46 +281,110 @@ def handle_path_and_filename(parts, url):
     return path, filename
 
 @handle_errors
-def download_file(url, filename, log):
-    """Download a file from various sources."""
+def download_file(url, path, filename, log, sha256=None):
+    """Download a file from various sources. Returns True on success."""
     is_special_domain = any(domain in url for domain in ['civitai.com', 'huggingface.co', 'github.com'])
 
-    if is_special_domain:
-        download_with_aria2(url, filename, log)
+    if get_engine(url) == 'native':
+        try:
+            download_with_engine(url, path, filename, log, sha256)
+            return True
+        except DownloadError as e:
+            log_message(f"> \033[33m[Native Engine]:\033[0m {e} -> falling back to aria2c", log)
+        return download_with_aria2(url, path, filename, log, sha256)
+    elif is_special_domain:
+        return download_with_aria2(url, path, filename, log, sha256)
     elif 'drive.google.com' in url:
-        download_google_drive(url, filename, log)
+        return download_google_drive(url, path, filename, log)
     else:
         """Download using curl."""
         command = f"curl -#JL '{url}'"
         if filename:
-            command += f" -o '{filename}'"
-        execute_shell_command(command, log)
+            command += f" -o '{path / filename}'"
+        else:
+            command += f" -O --output-dir '{path}'"
+        return execute_shell_command(command, log)
 
-def download_with_aria2(url, filename, log):
-    """Download using aria2c."""
-    aria2_args = ('aria2c --header="User-Agent: Mozilla/5.0" --allow-overwrite=true --console-log-level=error --stderr=true -c -x16 -s16 -k1M -j5')
+def download_with_aria2(url, path, filename, log, sha256=None):
+    """Download using aria2c, re-downloading the file if it fails the SHA256 check."""
+    allocation = 'falloc' if is_local_fs(path) else 'none'    # fallocate fails on FUSE mounts such as GDrive
+    aria2_args = ('aria2c --header="User-Agent: Mozilla/5.0" --allow-overwrite=true --console-log-level=error --stderr=true -c -x16 -s16 -k1M -j5 '
+                  f"--file-allocation={allocation}")
 
     if HF_TOKEN and 'huggingface.co' in url:
         aria2_args += f' --header="Authorization: Bearer {HF_TOKEN}"'
+    if sha256:
+        aria2_args += f' --checksum=sha-256={sha256.lower()} --check-integrity=true'
 
-    command = f"{aria2_args} '{url}'"
+    command = f"{aria2_args} -d '{path}' '{url}'"
 
     if not filename:
         filename = get_file_name(url)
     if filename:
         command += f" -o '{filename}'"
 
-    monitor_aria2_download(command, log)
+    return monitor_aria2_download(command, log)
+
+def is_local_fs(path):
+    """Check whether `path` lives on a local filesystem rather than a FUSE / network mount."""
+    path = os.path.realpath(path)
+    mount, fstype = '', ''
+    try:
+        with open('/proc/mounts') as f:
+            for line in f:
+                _, point, kind = line.split()[:3]
+                point = point.replace('\\040', ' ')
+                if (path == point or path.startswith(point.rstrip('/') + '/')) and len(point) >= len(mount):
+                    mount, fstype = point, kind
+    except OSError:
+        return True
+    return not fstype.startswith(REMOTE_FS_TYPES)
+
+def get_engine(url):
+    """Return the download engine configured for the URL host."""
+    host = urlparse(url).netloc.lower()
+    for domain, engine in DOWNLOAD_ENGINES.items():
+        if host == domain or host.endswith(f".{domain}"):
+            return engine
+    return 'aria2'
+
+def download_with_engine(url, path, filename, log, sha256=None):
+    """Download using the native range-request engine."""
+    headers = {}
+    if HF_TOKEN and 'huggingface.co' in url:
+        headers['Authorization'] = f"Bearer {HF_TOKEN}"
+
+    callback = print_progress_event if log else None
+    with RangeDownloader(headers=headers, callback=callback) as engine:
+        target = engine.download(url, path, filename or get_file_name(url), sha256)
+
+    log_message(f"\n>> Downloaded: \033[32m{target}\033[0m", log)
+
+def print_progress_event(event):
+    """Render a native engine ProgressEvent like an aria2c status line."""
+    size = f"{event.downloaded / 1024**2:.1f}MiB"
+    if event.total:
+        size += f"/{event.total / 1024**2:.1f}MiB\033[36m({event.percent}%)\033[0m"
+    line = f"\033[35m【\033[0m{event.filename} {size} DL:\033[32m{event.speed / 1024**2:.1f}MiB\033[0m"
+    if event.eta is not None:
+        line += f" ETA:\033[33m{int(event.eta)}s\033[0m"
+    line += '\033[35m】\033[0m'
+
+    with PRINT_LOCK:
+        print(f"\r{' ' * 180}\r{line}", end='')
+        sys.stdout.flush()
 
-def download_google_drive(url, filename, log):
+def download_google_drive(url, path, filename, log):
     """Download from Google Drive using gdown."""
     cmd = 'gdown --fuzzy ' + url
     if filename:
-        cmd += ' -O ' + filename
+        cmd += f" -O '{path / filename}'"
+    else:
+        cmd += f" -O '{path}{os.sep}'"
     if 'drive.google.com/drive/folders' in url:
         cmd += ' --folder'
 
-    execute_shell_command(cmd, log)
+    return execute_shell_command(cmd, log)
 
 def get_file_name(url):
     """Get the file name based on the URL."""
@@ -165,7 +402,7 @@ def unzip_file(zip_filepath, log):
 
 @handle_errors
 def monitor_aria2_download(command, log):
-    """Monitor aria2c download progress."""
+    """Monitor aria2c download progress. Returns True if aria2c exited cleanly."""
     try:
         process = subprocess.Popen(shlex.split(command), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
         error_codes, error_messages = [], []
@@ -185,28 +422,31 @@ def monitor_aria2_download(command, log):
                     if re.match(r'\[#\w{6}\s.*\]', output_line):
                         formatted_line = format_output_line(output_line)
                         if log:
-                            print(f"\r{' ' * 180}\r{formatted_line}", end='')
-                            sys.stdout.flush()
+                            with PRINT_LOCK:
+                                print(f"\r{' ' * 180}\r{formatted_line}", end='')
+                                sys.stdout.flush()
                         br = True
                         break
 
         if log:
-            for error in error_codes + error_messages:
-                print(f"{error}")
+            with PRINT_LOCK:
+                for error in error_codes + error_messages:
+                    print(f"{error}")
 
-            if br:
-                print()
+                if br:
+                    print()
 
-            stripe = result.find('======+====+===========')
-            if stripe != -1:
-                for line in result[stripe:].splitlines():
-                    if '|' in line and 'OK' in line:
-                        formatted_line = re.sub(r'(\|\s*)(OK)(\s*\|)', r'\1\033[32m\2\033[0m\3', line)
-                        print(f"{formatted_line}")
+                stripe = result.find('======+====+===========')
+                if stripe != -1:
+                    for line in result[stripe:].splitlines():
+                        if '|' in line and 'OK' in line:
+                            formatted_line = re.sub(r'(\|\s*)(OK)(\s*\|)', r'\1\033[32m\2\033[0m\3', line)
+                            print(f"{formatted_line}")
 
-        process.wait()
+        return process.wait() == 0
     except KeyboardInterrupt:
         log_message('\n> Download interrupted', log)
+        return False
 
 def format_output_line(line):
     """Format a line of output with ANSI color codes."""
@@ -229,19 +469,27 @@ def handle_error_output(line, error_codes, error_messages):
 
 @handle_errors
 def execute_shell_command(command, log):
-    """Execute a shell command and handle logging."""
+    """Execute a shell command and handle logging. Returns True if it exited cleanly."""
     process = subprocess.Popen(shlex.split(command), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
     if log:
         for line in process.stderr:
             print(line, end='')
-    process.wait()
+    return process.wait() == 0
+
+_civitai_api = None
+
+def civitai_api():
+    """Shared CivitAiAPI client for the whole session."""
+    global _civitai_api
+    if _civitai_api is None:
+        _civitai_api = CivitAiAPI(CAI_TOKEN)
+    return _civitai_api
 
 @handle_errors
 def clean_url(url):
     """Clean and format URLs to ensure correct access."""
     if 'civitai.com/models/' in url:
-        api = CivitAiAPI(CAI_TOKEN)
-        if not (data := api.validate_download(url)):
+        if not (data := civitai_api().validate_download(url)):
             return
 
         url = data.download_url
@@ -258,6 +506,46 @@ def clean_url(url):
 
     return url
 
+# Download + extract function
+@handle_errors
+def m_download_zip(url, dest, log=False):
+    """Download a ZIP archive straight into `dest`, extracting entries as they arrive.
+
+    Falls back to a full download + unzip when the archive cannot be streamed."""
+    dest = Path(dest).expanduser()
+    headers = {'Authorization': f"Bearer {HF_TOKEN}"} if HF_TOKEN and 'huggingface.co' in url else {}
+    callback = print_progress_event if log else None
+
+    try:
+        with RangeDownloader(headers=headers, callback=callback) as engine:
+            count = engine.download_zip(url, dest)
+        log_message(f"\n>> Unpacked {count} entries to: \033[32m{dest}\033[0m", log)
+        return
+    except DownloadError as e:
+        log_message(f"\n> Streaming unzip failed, falling back to download + unzip: {e}", log)
+
+    zip_path = dest.parent / f"{dest.name}.zip"
+    m_download(f"{url} {dest.parent} {zip_path.name}", log=log)
+    subprocess.run(['unzip', '-q', '-o', str(zip_path), '-d', str(dest)])
+    zip_path.unlink(missing_ok=True)
+
+# Download into a process
+def m_download_pipe(url, args, decoder=None, log=False):
+    """Stream a download into the stdin of a command (e.g. `tar xf -`) without saving it.
+
+    Returns True on success, False when the stream failed and the caller should fall back."""
+    headers = {'Authorization': f"Bearer {HF_TOKEN}"} if HF_TOKEN and 'huggingface.co' in url else {}
+    callback = print_progress_event if log else None
+
+    try:
+        with RangeDownloader(headers=headers, callback=callback) as engine:
+            engine.download_to_pipe(url, args, decoder)
+        log_message('', log)
+        return True
+    except DownloadError as e:
+        log_message(f"\n> \033[31m[Error]:\033[0m {e}", log)
+        return False
+
 ## ======================== Clone ========================
 
 def m_clone(input_source, log=False):
@@ -342,4 +630,122 @@ def execute_command(command, log=False):
 
         # Handle error messages
         if 'fatal' in output.lower():
-            log_message(f">> \033[31m[Error]:\033[0m {output}", log)
\ No newline at end of file
+            log_message(f">> \033[31m[Error]:\033[0m {output}", log)
+
+
+def _git_output(args, cwd):
+    result = subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines() or [f"git {args[0]} failed"]
+        raise RuntimeError(next((l for l in lines if l.startswith(('fatal:', 'error:'))), lines[-1]))
+    return result.stdout.strip()
+
+@dataclass
+class RepoClone:
+    """Result of installing one git repository"""
+    url: str
+    path: Path
+    status: str = 'cloned'          # cloned | present | conflict | failed
+    error: Optional[str] = None
+
+def _same_remote(a, b):
+    normalize = lambda url: re.sub(r'(\.git)?/*$', '', url.strip()).lower()
+    return normalize(a) == normalize(b)
+
+def clone_repository(url, directory, name=None):
+    """
+    Shallow-clone `url` into `directory/name`, skipping a checkout of the same remote.
+    An existing folder that is not that checkout is reported as a conflict and left untouched.
+    """
+    name = name or url.rstrip('/').split('/')[-1].removesuffix('.git')
+    result = RepoClone(url, Path(directory) / name)
+
+    try:
+        if (result.path / '.git').exists():
+            remote = _git_output(['remote', 'get-url', 'origin'], result.path)
+            if not _same_remote(remote, url):
+                result.status, result.error = 'conflict', f"already exists with remote {remote}"
+            else:
+                result.status = 'present'
+            return result
+        if os.path.lexists(result.path):
+            result.status, result.error = 'conflict', 'already exists and is not a git checkout'
+            return result
+
+        # Clone under a temporary name so a failed clone never touches or looks like the real folder
+        result.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = result.path.with_name(f".{name}.clone-{os.getpid()}-{threading.get_ident()}")
+        try:
+            _git_output(['clone', '--depth', '1', '--single-branch', '--no-tags',
+                         '--recurse-submodules', '--shallow-submodules', url, tmp.name], result.path.parent)
+            os.rename(tmp, result.path)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    except (RuntimeError, OSError) as e:
+        result.status, result.error = 'failed', str(e)
+    return result
+
+def m_clone_repos(repos, directory, log=False, max_workers=MAX_GIT_WORKERS):
+    """Clone (url, name) pairs into `directory` concurrently; returns a RepoClone per repository."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda repo: clone_repository(repo[0], directory, repo[1]), repos))
+
+    for result in results:
+        if result.status == 'failed':
+            log_message(f">> \033[31m[Error]:\033[0m {result.url}: {result.error}", log)
+        elif result.status == 'conflict':
+            log_message(f">> \033[33m[Skipped]:\033[0m {result.path}: {result.error}", log)
+        elif result.status == 'present':
+            log_message(f">> Already installed: {result.path.name}", log)
+        else:
+            log_message(f">> Cloned: {result.path.name} -> {result.url}", log)
+    return results
+
+
+## ======================== Update =======================
+
+@dataclass
+class RepoUpdate:
+    """Result of updating one git repository"""
+    path: Path
+    before: Optional[str] = None
+    after: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def changed(self):
+        return not self.error and self.before != self.after
+
+def update_repository(path):
+    """Shallow-fetch the upstream branch and hard-reset the repository to it."""
+    update = RepoUpdate(Path(path))
+    try:
+        update.before = _git_output(['rev-parse', 'HEAD'], path)
+        try:
+            remote, _, branch = _git_output(['rev-parse', '--abbrev-ref', '@{u}'], path).partition('/')
+        except RuntimeError:
+            remote, branch = 'origin', 'HEAD'    # detached or no upstream: remote default branch
+
+        _git_output(['fetch', '--depth', '1', remote, branch], path)
+        _git_output(['reset', '--hard', 'FETCH_HEAD'], path)
+        update.after = _git_output(['rev-parse', 'HEAD'], path)
+    except (RuntimeError, OSError) as e:
+        update.error = str(e)
+    return update
+
+def m_update(paths, log=False, max_workers=MAX_GIT_WORKERS):
+    """Update git repositories concurrently; returns a RepoUpdate per repository."""
+    repos = [Path(p) for p in paths if (Path(p) / '.git').exists()]
+    if not repos:
+        log_message('>> No git repositories to update', log)
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        updates = list(executor.map(update_repository, repos))
+
+    for update in updates:
+        if update.error:
+            log_message(f">> \033[31m[Error]:\033[0m {update.path.name}: {update.error}", log)
+        elif update.changed:
+            log_message(f">> Updated: {update.path.name} {update.before[:7]} -> {update.after[:7]}", log)
+    return updates
@@ -8,10 +8,11 @@ Use the original script of the author cupang-afk.
 """
 
 
-from typing import Callable, List, Optional, Tuple, TypedDict, Union, get_args
+from typing import Callable, Dict, List, Optional, Tuple, TypedDict, Union, get_args
 from threading import Event, Lock, Thread
 from pathlib import Path
 import subprocess
+import selectors
 import logging
 import socket
 import shlex
@@ -51,12 +52,14 @@ class FileFormatter(logging.Formatter):
         return self.strip_ansi_codes(formatted_message)
 
 
-class TunnelDict(TypedDict):
+class TunnelDict(TypedDict, total=False):
     command: str
     pattern: re.Pattern
     name: str
     note: Optional[str]
     callback: Optional[Callable[[str, Optional[str], Optional[str]], None]]
+    process: Optional[subprocess.Popen]    # already running process handed over by adopt_tunnel
+    output: Optional[str]                  # output the adopted process printed before the handover
 
 
 class Tunnel:
@@ -64,9 +67,13 @@ class Tunnel:
     A class for creating and managing tunnels.
 
     This class allows for the establishment of tunnels to redirect traffic through specified ports.
-    It supports local port checking, process and thread management, as well as logging for debugging
+    It supports local port checking, process management, as well as logging for debugging
     and monitoring tunnel operations.
 
+    All tunnel subprocesses are driven by a single I/O thread: their stdout pipes are multiplexed
+    with `selectors`, URL patterns are matched as lines arrive, and readiness is signalled through
+    events instead of sleeping, so the thread count does not grow with the number of tunnels.
+
     Attributes:
         port (int): The port on which the tunnel will be created.
         check_local_port (bool): Flag indicating whether to check the local port before creating the tunnel.
@@ -83,10 +90,12 @@ class Tunnel:
         urls (List[Tuple[str, Optional[str], Optional[str]]]): List of URLs associated with the tunnel,
             including the URL, note, and name of the tunnel.
         urls_lock (Lock): Mutex for safe access to the list of URLs, ensuring thread-safety.
-        jobs (List[Thread]): List of threads associated with the tunnel, used for managing tunnel processes.
+        jobs (List[Thread]): Threads owned by the tunnel (the single I/O loop thread).
         processes (List[subprocess.Popen]): List of running subprocesses for managing tunnels.
         tunnel_list (List[TunnelDict]): List of dictionaries containing parameters for each tunnel added.
         stop_event (Event): Event used to signal the stopping of tunnel operations.
+        port_ready (Event): Set once the local port accepts connections and the tunnels are launched.
+        urls_ready (Event): Set once every tunnel has reported its URL.
         printed (Event): Event indicating whether tunnel information has been printed to the console.
         logger (logging.Logger): Logger for recording information about the tunnel's operation, including
             errors and status updates.
@@ -115,7 +124,11 @@ class Tunnel:
         self.processes: List[subprocess.Popen] = []
         self.tunnel_list: List[TunnelDict] = []
         self.stop_event: Event = Event()
+        self.port_ready = Event()
+        self.urls_ready = Event()
         self.printed = Event()
+        self._wakeup_r, self._wakeup_w = os.pipe()    # lets stop() interrupt select()
+        os.set_blocking(self._wakeup_r, False)
         self.port = port
         self.check_local_port = check_local_port
         self.debug = debug
@@ -181,6 +194,30 @@ class Tunnel:
             'callback': callback,
         })
 
+    def adopt_tunnel(self, *, process: subprocess.Popen, output: str, pattern: StrOrRegexPattern, name: str,
+                     command: str = None, note: str = None,
+                     callback: Callable[[str, Optional[str], Optional[str]], None] = None) -> None:
+        """
+        Add an already running tunnel process, e.g. one kept alive after a successful probe.
+
+        `output` is what the process printed before the handover (it must contain the URL).
+        The process stdout is taken over by the I/O loop; once the tunnel is stopped the
+        process is gone and a later run relaunches `command` like a regular tunnel.
+        """
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+
+        self.logger.debug(f"Adopting tunnel {name=} pid={process.pid} {pattern=} {note=}")
+        self.tunnel_list.append({
+            'command': command,
+            'pattern': pattern,
+            'name': name,
+            'note': note,
+            'callback': callback,
+            'process': process,
+            'output': output,
+        })
+
     def start(self) -> None:
         """Start the tunnel and its associated threads."""
         if self._is_running:
@@ -189,8 +226,8 @@ class Tunnel:
         self.__enter__()
 
         try:
-            while not self.printed.is_set():
-                time.sleep(1)
+            while not self.printed.wait(timeout=1):
+                pass
         except KeyboardInterrupt:
             self.logger.warning('\033[33m⚠️  Keyboard Interrupt detected, stopping tunnel\033[0m')
             self.stop()
@@ -202,6 +239,7 @@ class Tunnel:
 
         self.logger.info(f"💣 \033[32mTunnels:\033[0m \033[34m{self.get_tunnel_names()}\033[0m -> \033[31mKilled.\033[0m")
         self.stop_event.set()
+        os.write(self._wakeup_w, b'x')
         self.terminate_processes()
         self.join_threads()
         self.reset()
@@ -234,27 +272,13 @@ class Tunnel:
         if not self.tunnel_list:
             raise ValueError('No tunnels added')
 
-        print_job = Thread(target=self._print)
-        print_job.start()
-        self.jobs.append(print_job)
-
-        for tunnel in self.tunnel_list:
-            self.start_tunnel_thread(tunnel)
+        loop_job = Thread(target=self._io_loop, daemon=True)
+        loop_job.start()
+        self.jobs.append(loop_job)
 
         self._is_running = True
         return self
 
-    def start_tunnel_thread(self, tunnel: TunnelDict) -> None:
-        """Start a new thread for the specified tunnel."""
-        try:
-            cmd = tunnel['command'].format(port=self.port)
-            name = tunnel.get('name')
-            tunnel_thread = Thread(target=self._run, args=(cmd, name))
-            tunnel_thread.start()
-            self.jobs.append(tunnel_thread)
-        except Exception as e:
-            self.logger.error(f"Failed to start tunnel {tunnel.get('name')}: {str(e)}")
-
     def __exit__(self, exc_type, exc_value, exc_tb):
         """Exit the runtime context for the tunnel, stopping it."""
         self.stop()
@@ -265,7 +289,14 @@ class Tunnel:
         self.jobs.clear()
         self.processes.clear()
         self.stop_event.clear()
+        self.port_ready.clear()
+        self.urls_ready.clear()
         self.printed.clear()
+        try:
+            while os.read(self._wakeup_r, 1024):    # drain stale stop() wakeups
+                pass
+        except BlockingIOError:
+            pass
         self._is_running = False
 
     @staticmethod
@@ -299,13 +330,6 @@ class Tunnel:
             next_interval = min(interval, (timeout - elapsed_time) / (checks_count + 1)) if timeout else interval
             time.sleep(next_interval)
 
-    def _process_line(self, line: str) -> bool:
-        """Process a line of output from the tunnel command to check for URLs."""
-        for tunnel in self.tunnel_list:
-            if self.extract_url(tunnel, line):
-                return True
-        return False
-
     def extract_url(self, tunnel: TunnelDict, line: str) -> bool:
         """Extract a URL from a line of output based on the tunnel's regex pattern."""
         regex = tunnel['pattern']
@@ -320,6 +344,8 @@ class Tunnel:
 
             with self.urls_lock:
                 self.urls.append((link, note, name))
+                if len(self.urls) >= len(self.tunnel_list):
+                    self.urls_ready.set()
 
             if callback:
                 self.invoke_callback(callback, link, note, name)
@@ -333,33 +359,126 @@ class Tunnel:
         except Exception:
             self.logger.error('An error occurred while invoking URL callback', exc_info=True)
 
-    def _run(self, cmd: str, name: str) -> None:
-        """Run the specified command in a subprocess, monitoring its output."""
+    def _io_loop(self) -> None:
+        """Single event loop: wait for the port, launch every tunnel and multiplex their output."""
+        selector = selectors.DefaultSelector()
+        selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+        try:
+            adopted = [t for t in self.tunnel_list if t.get('process') and t['process'].poll() is None]
+            for tunnel in adopted:
+                self._adopt(tunnel, selector)
+
+            if not self._wait_for_port():
+                return
+
+            for tunnel in self.tunnel_list:
+                if tunnel not in adopted and tunnel.get('command'):
+                    self._spawn(tunnel, selector)
+            self.port_ready.set()
+
+            deadline = time.monotonic() + max(1, self.timeout)
+            while not self.stop_event.is_set():
+                if not self.printed.is_set():
+                    if self.urls_ready.is_set():
+                        self.display_urls()
+                    elif time.monotonic() >= deadline:
+                        self.logger.warning('Timeout while getting tunnel URLs, print available URLs')
+                        self.display_urls()
+
+                if len(selector.get_map()) <= 1 and self.printed.is_set():
+                    break    # every tunnel process has exited
+
+                timeout = None if self.printed.is_set() else max(0, deadline - time.monotonic())
+                for key, _ in selector.select(timeout):
+                    if key.data is None:
+                        continue    # stop() wakeup
+                    self._read_output(key, selector)
+        except Exception as e:
+            self.logger.error(f"Error in tunnel loop: {str(e)}", exc_info=self.debug)
+        finally:
+            for key in list(selector.get_map().values()):
+                if key.data is not None:
+                    self._close_stream(key, selector)
+            selector.close()
+
+    def _wait_for_port(self) -> bool:
+        """Block until the local port is open (if requested). Returns False if stopped first."""
+        if self.check_local_port:
+            while not self.is_port_in_use(self.port):
+                if self.stop_event.wait(timeout=0.5):
+                    return False
+        return not self.stop_event.is_set()
+
+    def _tunnel_logger(self, name: str) -> logging.Logger:
         log_path = self.log_dir / f"tunnel_{name}.log"
         log_path.write_text('')  # Clear previous log file
 
         log = self.logger.getChild(name)  # Create a child logger for this tunnel
         self.setup_file_logging(log, log_path)  # Set up file logging for this tunnel
+        return log
+
+    def _register(self, tunnel: TunnelDict, process: subprocess.Popen, log: logging.Logger,
+                  selector: selectors.BaseSelector) -> dict:
+        self.processes.append(process)
+        os.set_blocking(process.stdout.fileno(), False)
+        state = {'tunnel': tunnel, 'log': log, 'buffer': b'', 'url_extracted': False}
+        selector.register(process.stdout, selectors.EVENT_READ, state)
+        return state
+
+    def _spawn(self, tunnel: TunnelDict, selector: selectors.BaseSelector) -> None:
+        """Start a tunnel subprocess and register its stdout with the selector."""
+        name = tunnel['name']
+        log = self._tunnel_logger(name)
 
         try:
-            self.wait_for_port_if_needed()
-            cmd = shlex.split(cmd)
             process = subprocess.Popen(
-                cmd,
+                shlex.split(tunnel['command'].format(port=self.port)),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 stdin=subprocess.PIPE,
-                universal_newlines=True,
-                bufsize=1,
             )
-            self.processes.append(process)
-            self.monitor_process_output(process, log)
-
+            self._register(tunnel, process, log, selector)
         except Exception as e:
-            log.error(f"Error in tunnel: {str(e)}", exc_info=self.debug)
-        finally:
-            for handler in log.handlers:
-                handler.close()  # Close any handlers associated with this logger
+            log.error(f"Failed to start tunnel {name}: {str(e)}", exc_info=self.debug)
+
+    def _adopt(self, tunnel: TunnelDict, selector: selectors.BaseSelector) -> None:
+        """Register a handed-over process and replay the output it printed before the handover."""
+        process, output = tunnel['process'], tunnel.get('output') or ''
+        tunnel['process'], tunnel['output'] = None, None    # one-shot: later runs relaunch the command
+
+        state = self._register(tunnel, process, self._tunnel_logger(tunnel['name']), selector)
+        for line in output.splitlines():
+            self._handle_line(state, line.encode())
+
+    def _read_output(self, key: selectors.SelectorKey, selector: selectors.BaseSelector) -> None:
+        """Read available bytes from a tunnel pipe and process every complete line."""
+        state = key.data
+        try:
+            chunk = os.read(key.fd, 65536)
+        except BlockingIOError:
+            return
+
+        if not chunk:
+            if state['buffer']:
+                self._handle_line(state, state['buffer'])
+            self._close_stream(key, selector)
+            return
+
+        *lines, state['buffer'] = (state['buffer'] + chunk).split(b'\n')
+        for line in lines:
+            self._handle_line(state, line)
+
+    def _handle_line(self, state: dict, raw: bytes) -> None:
+        line = raw.decode('utf-8', errors='replace')
+        if not state['url_extracted']:
+            state['url_extracted'] = self.extract_url(state['tunnel'], line)
+        state['log'].debug(line.rstrip())
+
+    def _close_stream(self, key: selectors.SelectorKey, selector: selectors.BaseSelector) -> None:
+        selector.unregister(key.fileobj)
+        key.fileobj.close()
+        for handler in key.data['log'].handlers:
+            handler.close()  # Close any handlers associated with this logger
 
     def setup_file_logging(self, log: logging.Logger, log_path: Path) -> None:
         """Set up file logging for the specified logger and log file path."""
@@ -369,41 +488,6 @@ class Tunnel:
             handler.setFormatter(FileFormatter("[%(name)s]: %(message)s"))
             log.addHandler(handler)
 
-    def wait_for_port_if_needed(self) -> None:
-        """Wait for the specified port to be available if the check_local_port flag is set."""
-        if self.check_local_port:
-            self.wait_for_condition(
-                lambda: self.is_port_in_use(self.port) or self.stop_event.is_set(),
-                interval=1,
-                timeout=None,
-            )
-
-    def monitor_process_output(self, process: subprocess.Popen, log: logging.Logger) -> None:
-        """Monitor the output of the subprocess and process any lines received."""
-        url_extracted = False
-        while not self.stop_event.is_set() and process.poll() is None:
-            line = process.stdout.readline()
-            if not line:
-                break
-            if not url_extracted:
-                url_extracted = self._process_line(line)
-            log.debug(line.rstrip())
-
-    def _print(self) -> None:
-        """Print the collected tunnel URLs."""
-        if self.check_local_port:
-            self.wait_for_port_if_needed()
-
-        if not self.wait_for_condition(
-            lambda: len(self.urls) == len(self.tunnel_list) or self.stop_event.is_set(),
-            interval=1,
-            timeout=self.timeout,
-        ):
-            self.logger.warning('Timeout while getting tunnel URLs, print available URLs')
-
-        if not self.stop_event.is_set():
-            self.display_urls()
-
     def display_urls(self) -> None:
         """Display the collected URLs in a formatted manner."""
         with self.urls_lock:
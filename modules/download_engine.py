@@ -0,0 +1,671 @@
+""" Download Engine Module | by ANXETY """
+
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse, unquote
+from typing import Callable, Optional
+from dataclasses import dataclass
+from pathlib import Path
+import subprocess
+import threading
+import requests
+import hashlib
+import weakref
+import queue
+import struct
+import errno
+import stat
+import time
+import zlib
+import os
+import re
+
+
+# Defaults
+WORKERS = 8                        # parallel range requests per file
+CHUNK_SIZE = 8 * 1024 * 1024       # bytes per range request
+READ_SIZE = 1024 * 1024            # bytes per socket read
+RETRIES = 3                        # attempts per chunk
+VERIFY_ATTEMPTS = 2                # whole-file fetches before a hash mismatch is an error
+TIMEOUT = (10, 60)                 # connect / read timeout (sec)
+PROGRESS_INTERVAL = 0.5            # min seconds between progress events
+
+USER_AGENT = 'Mozilla/5.0'
+
+
+class DownloadError(Exception):
+    """Raised when the native engine cannot complete a download"""
+
+
+class DownloadCancelled(Exception):
+    """Raised when a download is stopped by `cancel`; callers must not fall back to another engine"""
+
+
+_engines = weakref.WeakSet()
+_engines_lock = threading.Lock()
+
+
+def cancel_all():
+    """Stop the transfers of every open RangeDownloader (e.g. on Ctrl-C)"""
+    with _engines_lock:
+        engines = list(_engines)
+    for engine in engines:
+        engine.cancel()
+
+
+@dataclass
+class ProgressEvent:
+    """Structured progress report for a single file"""
+    filename: str
+    downloaded: int
+    total: Optional[int]
+    speed: float                    # bytes per second since start
+    done: bool = False
+
+    @property
+    def percent(self) -> Optional[int]:
+        return int(self.downloaded * 100 / self.total) if self.total else None
+
+    @property
+    def eta(self) -> Optional[float]:
+        if not self.total or not self.speed:
+            return None
+        return (self.total - self.downloaded) / self.speed
+
+
+@dataclass
+class RemoteFile:
+    """Result of probing a URL before downloading"""
+    url: str                        # final URL after redirects
+    size: Optional[int]
+    accepts_ranges: bool
+    filename: Optional[str]
+
+
+class RangeDownloader:
+    """
+    In-process HTTP downloader using parallel Range requests
+
+    The file is preallocated and every chunk is written at its own offset
+    with `os.pwrite`, so workers never share a file position. Servers without
+    Range support are downloaded as a single stream. A SHA256 of the data is
+    computed while it is written, so an expected hash is checked without
+    reading the file back. `cancel` (or `cancel_all`) stops every transfer at
+    the next read.
+
+    Usage Example:
+        engine = RangeDownloader(callback=print)
+        engine.download('https://huggingface.co/.../model.safetensors', '~/models')
+    """
+
+    def __init__(
+        self,
+        workers: int = WORKERS,
+        chunk_size: int = CHUNK_SIZE,
+        headers: Optional[dict] = None,
+        callback: Optional[Callable[[ProgressEvent], None]] = None,
+        timeout: tuple = TIMEOUT
+    ):
+        self.workers = max(1, workers)
+        self.chunk_size = max(READ_SIZE, chunk_size)
+        self.callback = callback
+        self.timeout = timeout
+        self.stop = threading.Event()
+        with _engines_lock:
+            _engines.add(self)
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT, **(headers or {})})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def cancel(self):
+        self.stop.set()
+
+    def _check_stop(self):
+        if self.stop.is_set():
+            raise DownloadCancelled('Download cancelled')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+    # --- Probing ---
+
+    def probe(self, url: str) -> RemoteFile:
+        """Resolve redirects and detect file size and Range support"""
+        try:
+            with self.session.get(url, headers={'Range': 'bytes=0-0'}, stream=True,
+                                  allow_redirects=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                filename = self._filename_from_response(response)
+
+                if response.status_code == 206:
+                    match = re.search(r'/(\d+)$', response.headers.get('Content-Range', ''))
+                    size = int(match.group(1)) if match else None
+                    return RemoteFile(response.url, size, size is not None, filename)
+
+                length = response.headers.get('Content-Length')
+                return RemoteFile(response.url, int(length) if length else None, False, filename)
+        except requests.RequestException as e:
+            raise DownloadError(f"Probe failed for {url}: {e}") from e
+
+    @staticmethod
+    def _filename_from_response(response) -> Optional[str]:
+        disposition = response.headers.get('Content-Disposition', '')
+        if match := re.search(r"filename\*=(?:UTF-8'')?([^;]+)", disposition, re.IGNORECASE):
+            return unquote(match.group(1).strip('"'))
+        if match := re.search(r'filename="?([^";]+)"?', disposition, re.IGNORECASE):
+            return match.group(1)
+        return Path(urlparse(response.url).path).name or None
+
+    # --- Download ---
+
+    def download(self, url: str, path: str | Path, filename: Optional[str] = None,
+                 sha256: Optional[str] = None) -> Path:
+        """
+        Download `url` into directory `path`
+
+        Args:
+            url: Source URL (redirects are followed once during probing)
+            path: Destination directory
+            filename: Optional file name, otherwise taken from the server
+            sha256: Expected SHA256, checked against a digest computed while
+                writing; a mismatch re-fetches the file once
+
+        Returns:
+            Path of the finished file
+        """
+        remote = self.probe(url)
+        filename = filename or remote.filename
+        if not filename:
+            raise DownloadError(f"Cannot determine file name for {url}")
+
+        path = Path(path).expanduser()
+        path.mkdir(parents=True, exist_ok=True)
+        target = path / filename
+        part = path / f"{filename}.part"
+        sha256 = sha256.lower() if sha256 else None
+
+        for attempt in range(1, VERIFY_ATTEMPTS + 1):
+            progress = _Progress(filename, remote.size, self.callback)
+            digest = self._transfer(remote, part, progress)
+            if not sha256 or digest == sha256:
+                break
+            part.unlink(missing_ok=True)
+            if attempt == VERIFY_ATTEMPTS:
+                raise DownloadError(f"SHA256 mismatch for {filename}: expected {sha256}, got {digest}")
+
+        os.replace(part, target)
+        progress.finish()
+        return target
+
+    def _transfer(self, remote: RemoteFile, part: Path, progress: '_Progress') -> str:
+        """Write the remote file to `part` and return its SHA256"""
+        fd = os.open(part, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if remote.size:
+                _preallocate(fd, remote.size)
+            if remote.accepts_ranges and remote.size:
+                return self._download_ranges(remote, fd, progress)
+            return self._download_stream(remote, fd, progress)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+        finally:
+            os.close(fd)
+
+    def _download_stream(self, remote: RemoteFile, fd: int, progress: '_Progress') -> str:
+        """Fallback for servers without Range support"""
+        sha256 = hashlib.sha256()
+        try:
+            with self.session.get(remote.url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                offset = 0
+                for data in response.iter_content(READ_SIZE):
+                    self._check_stop()
+                    os.pwrite(fd, data, offset)
+                    sha256.update(data)
+                    offset += len(data)
+                    progress.advance(len(data))
+                os.ftruncate(fd, offset)    # drop preallocated space past a shorter body
+        except requests.RequestException as e:
+            raise DownloadError(f"Download failed for {remote.url}: {e}") from e
+        return sha256.hexdigest()
+
+    def _download_ranges(self, remote: RemoteFile, fd: int, progress: '_Progress') -> str:
+        """Fetch fixed-size chunks in order with a pool of worker threads"""
+        chunks = iter(range(0, remote.size, self.chunk_size))
+        chunks_lock = threading.Lock()
+        hasher = _OrderedHasher(self.chunk_size * self.workers)
+        errors = []
+
+        def worker():
+            while not errors:
+                with chunks_lock:
+                    start = next(chunks, None)
+                if start is None or not hasher.wait_turn(start):
+                    return
+                end = min(start + self.chunk_size, remote.size) - 1
+                try:
+                    hasher.add(start, self._fetch_chunk(remote.url, fd, start, end, progress))
+                except Exception as e:    # any failure (e.g. ENOSPC from pwrite) must release the other workers
+                    errors.append(e)
+                    hasher.close()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            if isinstance(errors[0], (DownloadError, DownloadCancelled)):
+                raise errors[0]
+            raise DownloadError(f"Range worker failed for {remote.url}: {errors[0]!r}") from errors[0]
+        return hasher.hexdigest()
+
+    def _fetch_chunk(self, url: str, fd: int, start: int, end: int, progress: '_Progress') -> bytes:
+        """Download bytes [start, end] with retries, writing them at their offset; returns the chunk"""
+        for attempt in range(1, RETRIES + 1):
+            written = 0
+            buffer = bytearray()
+            try:
+                with self.session.get(url, headers={'Range': f"bytes={start}-{end}"},
+                                      stream=True, timeout=self.timeout) as response:
+                    if response.status_code != 206:
+                        raise DownloadError(f"Server ignored Range request (HTTP {response.status_code})")
+
+                    for data in response.iter_content(READ_SIZE):
+                        self._check_stop()
+                        data = data[:end - start + 1 - written]
+                        os.pwrite(fd, data, start + written)
+                        buffer += data
+                        written += len(data)
+                        progress.advance(len(data))
+
+                if written == end - start + 1:
+                    return bytes(buffer)
+                raise DownloadError(f"Short read for bytes {start}-{end}")
+            except (requests.RequestException, DownloadError) as e:
+                progress.advance(-written)
+                if attempt == RETRIES:
+                    raise DownloadError(f"Chunk {start}-{end} failed: {e}") from e
+                time.sleep(attempt)
+
+
+    # --- Streaming into a process ---
+
+    def download_to_pipe(self, url: str, args: list, decoder: Optional[Callable[[bytes], bytes]] = None):
+        """
+        Stream `url` into the stdin of a command (e.g. `tar xf -`) without touching disk
+
+        The network is read on a separate thread through a bounded queue, so
+        receiving, decoding and the consuming process all overlap.
+
+        Args:
+            url: Source URL
+            args: Command that receives the bytes on stdin
+            decoder: Optional callable applied to every chunk (a streaming decompressor)
+        """
+        chunks = queue.Queue(maxsize=16)
+        errors = []
+
+        try:
+            response = self.session.get(url, stream=True, allow_redirects=True, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            raise DownloadError(f"Streaming failed for {url}: {e}") from e
+
+        length = response.headers.get('Content-Length')
+        progress = _Progress(self._filename_from_response(response) or url, int(length) if length else None, self.callback)
+
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    return chunks.put(item, timeout=1)
+                except queue.Full:
+                    continue
+
+        def reader():
+            try:
+                for data in response.iter_content(READ_SIZE):
+                    if stop.is_set() or self.stop.is_set():
+                        return
+                    put(data)
+                    progress.advance(len(data))
+            except Exception as e:    # also raised when the stream is closed on abort
+                errors.append(e)
+            finally:
+                put(None)
+
+        process = subprocess.Popen(args, stdin=subprocess.PIPE)
+        thread = threading.Thread(target=reader, daemon=True)
+        thread.start()
+        try:
+            while (data := chunks.get()) is not None:
+                process.stdin.write(decoder(data) if decoder else data)
+            self._check_stop()    # the reader ends the queue early on cancel
+            process.stdin.close()
+        except BaseException as e:
+            stop.set()
+            process.kill()
+            process.wait()
+            if isinstance(e, Exception) and not isinstance(e, DownloadCancelled):
+                raise DownloadError(f"Streaming failed for {url}: {e}") from e
+            raise
+        finally:
+            response.close()
+
+        if errors:
+            process.wait()
+            raise DownloadError(f"Streaming failed for {url}: {errors[0]}")
+        if process.wait() != 0:
+            raise DownloadError(f"{args[0]} exited with code {process.returncode}")
+        progress.finish()
+
+    # --- Streaming unzip ---
+
+    def download_zip(self, url: str, dest: str | Path) -> int:
+        """
+        Download a ZIP archive and extract it into `dest` while the bytes arrive
+
+        No archive is written to disk. Entries are decompressed in stream order
+        from their local headers; permissions and symlinks are applied from the
+        central directory at the end. Raises DownloadError when the archive
+        cannot be streamed (e.g. stored entries with data descriptors) or any
+        entry fails to extract, so the caller can fall back to a regular download.
+
+        Returns:
+            Number of extracted entries
+        """
+        dest = Path(dest).expanduser()
+        try:
+            with self.session.get(url, stream=True, allow_redirects=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                length = response.headers.get('Content-Length')
+                filename = self._filename_from_response(response) or 'archive.zip'
+                progress = _Progress(filename, int(length) if length else None, self.callback)
+
+                def chunks():
+                    for data in response.iter_content(READ_SIZE):
+                        self._check_stop()
+                        progress.advance(len(data))
+                        yield data
+
+                count = _ZipStream(chunks(), dest).extract()
+        except (DownloadError, DownloadCancelled):
+            raise
+        except requests.RequestException as e:
+            raise DownloadError(f"Streaming failed for {url}: {e}") from e
+        except Exception as e:    # corrupt data, bad names, disk errors: let the caller fall back
+            raise DownloadError(f"Extraction failed for {url}: {e!r}") from e
+
+        progress.finish()
+        return count
+
+
+def _preallocate(fd: int, size: int):
+    """
+    Reserve `size` contiguous bytes for a download so a full disk fails before any
+    transfer and the file is not fragmented. Falls back to a sparse file where
+    `posix_fallocate` is unsupported
+    """
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except AttributeError:
+        os.ftruncate(fd, size)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            raise
+        os.ftruncate(fd, size)
+
+
+class _OrderedHasher:
+    """
+    SHA256 over chunks that complete out of order
+
+    Finished chunks wait in memory until every byte before them is hashed,
+    so the file is never read back. `wait_turn` keeps workers from starting
+    chunks more than `window` bytes past the hashed prefix, which bounds that buffer
+    """
+
+    def __init__(self, window: int):
+        self.sha256 = hashlib.sha256()
+        self.window = window
+        self.offset = 0
+        self.pending = {}
+        self.closed = False
+        self.cond = threading.Condition()
+
+    def wait_turn(self, start: int) -> bool:
+        """Block until a chunk at `start` fits in the window; False once closed"""
+        with self.cond:
+            while start - self.offset >= self.window and not self.closed:
+                self.cond.wait()
+            return not self.closed
+
+    def add(self, start: int, data: bytes):
+        with self.cond:
+            self.pending[start] = data
+            while self.offset in self.pending:
+                data = self.pending.pop(self.offset)
+                self.sha256.update(data)
+                self.offset += len(data)
+            self.cond.notify_all()
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def hexdigest(self) -> str:
+        return self.sha256.hexdigest()
+
+
+class _ByteStream:
+    """Exact-size reads over an iterator of byte chunks"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = b''
+
+    def read(self, size: int) -> bytes:
+        """Up to `size` bytes, b'' at the end of the stream"""
+        if not self.buffer:
+            self.buffer = next(self.chunks, b'')
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def read_exact(self, size: int) -> bytes:
+        parts = []
+        while size:
+            data = self.read(size)
+            if not data:
+                raise DownloadError('Unexpected end of archive')
+            parts.append(data)
+            size -= len(data)
+        return b''.join(parts)
+
+    def unread(self, data: bytes):
+        self.buffer = data + self.buffer
+
+
+class _ZipStream:
+    """Sequential ZIP reader that extracts entries from local file headers"""
+
+    LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+    CENTRAL_HEADER = struct.Struct('<4sHHHHHHIIIHHHHHII')
+    LOCAL_SIG = b'PK\x03\x04'
+    CENTRAL_SIG = b'PK\x01\x02'
+    DESCRIPTOR_SIG = b'PK\x07\x08'
+
+    def __init__(self, chunks, dest: Path):
+        self.stream = _ByteStream(chunks)
+        self.dest = dest
+        self.extracted = {}    # archive name -> extracted path
+
+    def extract(self) -> int:
+        self.dest.mkdir(parents=True, exist_ok=True)
+        signature = self.stream.read_exact(4)
+        if signature != self.LOCAL_SIG:
+            raise DownloadError('Not a ZIP archive or not streamable')
+
+        while signature == self.LOCAL_SIG:
+            self._extract_entry()
+            signature = self.stream.read_exact(4)
+
+        while signature == self.CENTRAL_SIG:
+            self._apply_attributes()
+            signature = self.stream.read_exact(4)
+
+        return len(self.extracted)
+
+    def _target(self, name: str) -> Path:
+        target = (self.dest / name).resolve()
+        if not target.is_relative_to(self.dest.resolve()):
+            raise DownloadError(f"Unsafe path in archive: {name}")
+        return target
+
+    @staticmethod
+    def _zip64_sizes(extra: bytes, csize: int, usize: int) -> tuple:
+        while len(extra) >= 4:
+            tag, length = struct.unpack('<HH', extra[:4])
+            if tag == 0x0001:
+                values = list(struct.unpack(f"<{length // 8}Q", extra[4:4 + length // 8 * 8]))
+                if usize == 0xFFFFFFFF and values:
+                    usize = values.pop(0)
+                if csize == 0xFFFFFFFF and values:
+                    csize = values.pop(0)
+                break
+            extra = extra[4 + length:]
+        return csize, usize
+
+    def _extract_entry(self):
+        (_, _, flags, method, mtime, mdate, crc, csize, usize,
+         name_len, extra_len) = self.LOCAL_HEADER.unpack(self.LOCAL_SIG + self.stream.read_exact(26))
+        name = self.stream.read_exact(name_len).decode('utf-8' if flags & 0x800 else 'cp437')
+        extra = self.stream.read_exact(extra_len)
+        zip64 = csize == 0xFFFFFFFF or usize == 0xFFFFFFFF
+        csize, usize = self._zip64_sizes(extra, csize, usize)
+        has_descriptor = flags & 0x08
+
+        if flags & 0x01:
+            raise DownloadError(f"Encrypted entry: {name}")
+        if method not in (0, 8) or (method == 0 and has_descriptor):
+            raise DownloadError(f"Entry cannot be streamed: {name} (method {method})")
+
+        target = self._target(name)
+        if name.endswith('/'):
+            target.mkdir(parents=True, exist_ok=True)
+            self.stream.read_exact(csize)
+            self.extracted[name] = target
+            return
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.is_symlink():
+            target.unlink()
+
+        checksum = 0
+        with open(target, 'wb') as f:
+            if method == 0:
+                remaining = csize
+                while remaining:
+                    data = self.stream.read_exact(min(remaining, READ_SIZE))
+                    checksum = zlib.crc32(data, checksum)
+                    f.write(data)
+                    remaining -= len(data)
+            else:
+                inflater = zlib.decompressobj(-15)
+                remaining = None if has_descriptor else csize
+                while not inflater.eof:
+                    size = READ_SIZE if remaining is None else min(remaining, READ_SIZE)
+                    data = self.stream.read(size) if size else b''
+                    if not data:
+                        raise DownloadError(f"Truncated entry: {name}")
+                    if remaining is not None:
+                        remaining -= len(data)
+                    out = inflater.decompress(data)
+                    checksum = zlib.crc32(out, checksum)
+                    f.write(out)
+                self.stream.unread(inflater.unused_data)
+
+        if has_descriptor:
+            crc = self._read_descriptor(zip64)
+        if checksum != crc:
+            raise DownloadError(f"CRC mismatch: {name}")
+
+        timestamp = time.mktime((
+            (mdate >> 9) + 1980, (mdate >> 5) & 0xF, mdate & 0x1F,
+            mtime >> 11, (mtime >> 5) & 0x3F, (mtime & 0x1F) * 2, 0, 0, -1
+        ))
+        os.utime(target, (timestamp, timestamp))
+        self.extracted[name] = target
+
+    def _read_descriptor(self, zip64: bool) -> int:
+        """Read the data descriptor after an entry and return its CRC"""
+        head = self.stream.read_exact(4)
+        if head == self.DESCRIPTOR_SIG:
+            head = self.stream.read_exact(4)
+        self.stream.read_exact(16 if zip64 else 8)    # compressed / uncompressed sizes
+        return struct.unpack('<I', head)[0]
+
+    def _apply_attributes(self):
+        """Apply Unix modes and symlinks recorded in a central directory entry"""
+        fields = self.CENTRAL_HEADER.unpack(self.CENTRAL_SIG + self.stream.read_exact(42))
+        made_by, flags = fields[1], fields[3]
+        name_len, extra_len, comment_len, external_attr = fields[10], fields[11], fields[12], fields[15]
+        name = self.stream.read_exact(name_len).decode('utf-8' if flags & 0x800 else 'cp437')
+        self.stream.read_exact(extra_len + comment_len)
+
+        target = self.extracted.get(name)
+        mode = external_attr >> 16
+        if target is None or made_by >> 8 != 3 or not mode:
+            return    # not created on Unix, keep default permissions
+
+        if stat.S_ISLNK(mode):
+            link = target.read_text(encoding='utf-8')
+            target.unlink()
+            os.symlink(link, target)
+        elif not target.is_symlink():
+            os.chmod(target, stat.S_IMODE(mode))
+
+
+class _Progress:
+    """Thread-safe byte counter that emits throttled ProgressEvents"""
+
+    def __init__(self, filename: str, total: Optional[int], callback: Optional[Callable]):
+        self.filename = filename
+        self.total = total
+        self.callback = callback
+        self.downloaded = 0
+        self.started = time.monotonic()
+        self.last_emit = 0.0
+        self.lock = threading.Lock()
+
+    def _event(self, done=False) -> ProgressEvent:
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        return ProgressEvent(self.filename, self.downloaded, self.total, self.downloaded / elapsed, done)
+
+    def advance(self, amount: int):
+        with self.lock:
+            self.downloaded += amount
+            now = time.monotonic()
+            if not self.callback or now - self.last_emit < PROGRESS_INTERVAL:
+                return
+            self.last_emit = now
+            event = self._event()
+        self.callback(event)
+
+    def finish(self):
+        if self.callback:
+            with self.lock:
+                event = self._event(done=True)
+            self.callback(event)
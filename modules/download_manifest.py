@@ -0,0 +1,127 @@
+""" Download Manifest Module | by ANXETY """
+
+import json_utils as js    # JSON
+
+from typing import Optional
+from pathlib import Path
+import hashlib
+import time
+import os
+
+
+# Constants
+MANIFEST_NAME = '.downloads.json'
+HASH_READ_SIZE = 4 * 1024 * 1024
+
+
+def file_sha256(path: str | Path) -> str:
+    """SHA256 of a local file"""
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while data := f.read(HASH_READ_SIZE):
+            sha256.update(data)
+    return sha256.hexdigest()
+
+
+class DownloadManifest:
+    """
+    Record of finished downloads kept in every target folder (`.downloads.json`)
+
+    Each entry maps a requested URL to the file it produced: requested and
+    resolved file name, size, SHA256, CivitAI version ID and download URL.
+    `find` checks an entry against the file on disk with a single `stat`, so
+    a finished item is skipped without any network request. Files removed or
+    changed since (cleaner, eviction) simply stop matching.
+
+    Usage Example:
+        manifest = DownloadManifest()
+        if not manifest.find(url, model_dir, file_name):
+            ...  # download
+            manifest.add(url, model_dir, file_name, file_name, sha256=sha256, size=size)
+        manifest.save()
+    """
+
+    def __init__(self):
+        self.manifests = {}    # directory -> {url: entry}
+        self.dirty = set()
+
+    def _entries(self, directory: str | Path) -> dict:
+        directory = os.path.abspath(str(directory))
+        if directory not in self.manifests:
+            path = Path(directory) / MANIFEST_NAME
+            self.manifests[directory] = js.read(path, 'files', {}) if path.exists() else {}
+        return self.manifests[directory]
+
+    def find(self, url: str, directory: str | Path, requested: Optional[str] = None) -> Optional[dict]:
+        """Return the entry for a finished download that is still intact on disk"""
+        entry = self._entries(directory).get(url)
+        if not entry or entry.get('requested') != requested:
+            return None
+
+        target = Path(directory) / entry['file']
+        if Path(f"{target}.aria2").exists():
+            return None
+        try:
+            stat = target.stat()
+        except OSError:
+            return None
+        return entry if stat.st_size == entry['size'] and stat.st_mtime == entry['mtime'] else None
+
+    def add(self, url: str, directory: str | Path, requested: Optional[str], file_name: str,
+            sha256: Optional[str] = None, version_id: Optional[str] = None,
+            download_url: Optional[str] = None, size: Optional[int] = None) -> bool:
+        """
+        Record a finished download once it is verified: against the expected `size`
+        if known, otherwise against `sha256`. Returns False if nothing was recorded
+        """
+        target = Path(directory) / file_name
+        if Path(f"{target}.aria2").exists():
+            return False
+        try:
+            stat = target.stat()
+        except OSError:
+            return False
+
+        if size is not None:
+            if stat.st_size != size:
+                return False
+        elif not sha256 or file_sha256(target) != sha256.lower():
+            return False
+
+        self._entries(directory)[url] = {
+            'requested': requested,
+            'file': file_name,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha256': sha256.lower() if sha256 else None,
+            'version_id': version_id,
+            'url': download_url or url,
+            'time': time.time()
+        }
+        self.dirty.add(os.path.abspath(str(directory)))
+        return True
+
+    def files(self, directory: str | Path) -> set[str]:
+        """Absolute paths of the files recorded in a folder"""
+        directory = os.path.abspath(str(directory))
+        return {os.path.join(directory, entry['file']) for entry in self._entries(directory).values()}
+
+    def verify(self, url: str, directory: str | Path, requested: Optional[str] = None) -> bool:
+        """Re-hash a recorded file against its SHA256; drops the entry on mismatch"""
+        if not (entry := self.find(url, directory, requested)) or not entry['sha256']:
+            return False
+        if file_sha256(Path(directory) / entry['file']) == entry['sha256']:
+            return True
+        self.discard(url, directory)
+        return False
+
+    def discard(self, url: str, directory: str | Path):
+        if self._entries(directory).pop(url, None):
+            self.dirty.add(os.path.abspath(str(directory)))
+
+    def save(self):
+        """Write every changed manifest"""
+        for directory in self.dirty:
+            if os.path.isdir(directory):
+                js.save(Path(directory) / MANIFEST_NAME, 'files', self.manifests[directory])
+        self.dirty.clear()
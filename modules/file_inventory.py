@@ -0,0 +1,126 @@
+""" File Inventory Module | by ANXETY """
+
+import json_utils as js    # JSON
+
+from typing import Iterable, NamedTuple, Optional
+from pathlib import Path
+import os
+
+
+# Constants
+HOME = Path.home()
+SCR_PATH = HOME / 'ANXETY'
+INVENTORY_PATH = SCR_PATH / 'cache' / 'inventory.json'
+
+
+class FileEntry(NamedTuple):
+    """A file found by the scanner"""
+    path: str
+    size: int
+    mtime: float
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+
+class FileInventory:
+    """
+    Cached recursive file listing built on `os.scandir`
+
+    Every directory is stored with its mtime, its files `(name, size, mtime)`
+    and its subdirectories. A later scan only lists directories whose mtime
+    changed; unchanged ones (e.g. Google Drive folders behind the `GDrive`
+    symlinks) cost a single `stat`. File sizes are as of the last change of
+    their directory, pass `refresh=True` when exact sizes matter.
+
+    Symlinked directories are followed by default, with a guard against link loops.
+
+    Usage Example:
+        inventory = FileInventory()
+        models = inventory.files(model_dir, extensions=('.safetensors',))
+        inventory.save()
+    """
+
+    def __init__(self, cache_path: str | Path = INVENTORY_PATH):
+        self.cache_path = Path(cache_path)
+        self.dirs = js.read(self.cache_path, 'dirs', {}) if self.cache_path.exists() else {}
+        self.dirty = False
+
+    def _list_dir(self, path: str, mtime_ns: int) -> dict:
+        files, subdirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=True):
+                        subdirs.append(entry.name)
+                    elif entry.is_file(follow_symlinks=True):
+                        stat = entry.stat(follow_symlinks=True)
+                        files.append([entry.name, stat.st_size, stat.st_mtime])
+                except OSError:
+                    continue    # broken symlink or vanished entry
+
+        record = {'mtime_ns': mtime_ns, 'files': files, 'dirs': subdirs}
+        self.dirs[path] = record
+        self.dirty = True
+        return record
+
+    def scan(self, root: str | Path, exclude_dirs: Iterable[str] = (), refresh: bool = False,
+             follow_symlinks: bool = True) -> list[FileEntry]:
+        """Return every file below `root`, rescanning only directories that changed"""
+        root = os.path.abspath(os.path.expanduser(str(root)))
+        exclude_dirs = set(exclude_dirs)
+        visited = set()    # (st_dev, st_ino) of real directories, guards symlink loops
+        result = []
+        stack = [root]
+
+        while stack:
+            path = stack.pop()
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self.forget(path)
+                continue
+
+            if (stat.st_dev, stat.st_ino) in visited:
+                continue
+            visited.add((stat.st_dev, stat.st_ino))
+
+            record = self.dirs.get(path)
+            if refresh or not record or record['mtime_ns'] != stat.st_mtime_ns:
+                try:
+                    record = self._list_dir(path, stat.st_mtime_ns)
+                except OSError:
+                    continue
+
+            result.extend(FileEntry(os.path.join(path, name), size, mtime) for name, size, mtime in record['files'])
+            for name in reversed(record['dirs']):
+                child = os.path.join(path, name)
+                if name not in exclude_dirs and (follow_symlinks or not os.path.islink(child)):
+                    stack.append(child)
+
+        return result
+
+    def files(self, root: str | Path, extensions: Optional[tuple] = None, exclude_dirs: Iterable[str] = (),
+              refresh: bool = False, follow_symlinks: bool = True) -> list[FileEntry]:
+        """`scan` filtered by file extension"""
+        if not os.path.isdir(os.path.expanduser(str(root))):
+            return []
+        entries = self.scan(root, exclude_dirs, refresh, follow_symlinks)
+        if extensions:
+            entries = [entry for entry in entries if entry.path.endswith(extensions)]
+        return entries
+
+    def forget(self, path: str | Path):
+        """Drop a directory and everything below it from the cache"""
+        path = os.path.abspath(str(path))
+        for key in [key for key in self.dirs if key == path or key.startswith(path + os.sep)]:
+            del self.dirs[key]
+            self.dirty = True
+
+    def save(self):
+        """Persist the cache if anything changed"""
+        if self.dirty:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            js.save(self.cache_path, 'dirs', self.dirs)
+            self.dirty = False
@@ -1,8 +1,13 @@
 """ JSON Utilities Module | by ANXETY """
 
+from contextlib import contextmanager
 from functools import wraps
 from pathlib import Path
+import threading
+import tempfile
 import logging
+import fcntl
+import copy
 import json
 import os
 
@@ -107,37 +112,178 @@ def _set_nested_value(data: dict, keys: list, value: any):
         current = current[key]
     current[keys[-1]] = value
 
+# ==================== Document Cache ====================
+
+_cache: dict[str, tuple[tuple, dict]] = {}    # path -> (stat signature, parsed document)
+_transactions: dict[str, tuple] = {}          # path -> (owner thread id, live document) inside transaction()
+_dirty: set[str] = set()                      # transaction paths with pending changes
+_lock_depth: dict[str, int] = {}              # path -> nesting depth of _file_lock
+_lock_files: dict[str, int] = {}              # path -> fd holding the flock
+_path_locks: dict[str, threading.RLock] = {}  # path -> lock serialising threads on that file
+_cache_lock = threading.RLock()
+
+def _cache_key(filepath: str | Path) -> str:
+    return os.path.abspath(filepath)
+
+def _transaction_doc(key: str):
+    """The live transaction document if the current thread owns one for `key`"""
+    owner, data = _transactions.get(key, (None, None))
+    return data if owner == threading.get_ident() else None
+
+def _signature(filepath: str | Path) -> tuple:
+    """File identity used to detect external changes (mtime, size, inode)"""
+    st = os.stat(filepath)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
 def _read_json(filepath: str | Path) -> dict:
     """
-    Safely read JSON file, returning empty dict on error/missing file
+    Return the cached document for a JSON file, re-parsing only when the file changed
+
+    The returned dict is shared with the cache and must never be mutated:
+    readers copy what they hand out, writers use _read_for_write. Cached
+    documents are only ever replaced (copy-on-write), so other threads can
+    copy them without holding the lock.
 
     Args:
         filepath: Path to JSON file (str or Path object)
     """
-    try:
-        if not os.path.exists(filepath):
+    key = _cache_key(filepath)
+    with _cache_lock:
+        if (data := _transaction_doc(key)) is not None:
+            return data
+
+        try:
+            if not os.path.exists(filepath):
+                _cache.pop(key, None)
+                return {}
+
+            signature = _signature(filepath)
+            cached = _cache.get(key)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+            with open(filepath, 'r') as f:
+                content = f.read()
+                data = json.loads(content) if content.strip() else {}
+            _cache[key] = (signature, data)
+            return data
+        except Exception as e:
+            _cache.pop(key, None)
+            logger.error(f"Read error ({filepath}): {str(e)}")
             return {}
 
-        with open(filepath, 'r') as f:
-            content = f.read()
-            return json.loads(content) if content.strip() else {}
-    except Exception as e:
-        logger.error(f"Read error ({filepath}): {str(e)}")
-        return {}
+def _read_for_write(filepath: str | Path) -> dict:
+    """Private copy of the document to mutate and pass to _write_json"""
+    key = _cache_key(filepath)
+    with _cache_lock:
+        if (data := _transaction_doc(key)) is not None:
+            return data    # already private to this thread's transaction
+        return copy.deepcopy(_read_json(filepath))
 
 def _write_json(filepath: str | Path, data: dict):
     """
-    Write JSON file with directory creation and error handling
+    Atomically write JSON file (temp file + fsync + os.replace)
+
+    Inside transaction() the write is deferred until the transaction ends.
 
     Args:
         filepath: Destination path (str or Path object)
     """
-    try:
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-    except Exception as e:
-        logger.error(f"Write error ({filepath}): {str(e)}")
+    key = _cache_key(filepath)
+    with _cache_lock:
+        if _transaction_doc(key) is not None:
+            _transactions[key] = (threading.get_ident(), data)
+            _dirty.add(key)
+            return
+
+        tmp_path = None
+        try:
+            directory = os.path.dirname(key)
+            os.makedirs(directory, exist_ok=True)
+            mode = os.stat(filepath).st_mode & 0o777 if os.path.exists(filepath) else 0o644
+
+            # Write to a temp file in the same directory, then atomically swap it in
+            with tempfile.NamedTemporaryFile('w', dir=directory, prefix=f".{os.path.basename(key)}.",
+                                             suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                json.dump(data, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, filepath)
+            _cache[key] = (_signature(filepath), data)
+        except Exception as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            _cache.pop(key, None)
+            logger.error(f"Write error ({filepath}): {str(e)}")
+
+@contextmanager
+def _file_lock(filepath: str | Path):
+    """
+    Hold an exclusive advisory lock for a read-modify-write cycle
+
+    Threads are serialised by a lock per path, so other files stay available;
+    other processes by `fcntl.flock` on a `<file>.lock` sidecar (the JSON file
+    itself is replaced on every write). The module cache lock is never held
+    while waiting here. Re-entrant within one thread, so nested calls don't deadlock.
+    """
+    key = _cache_key(filepath)
+    with _cache_lock:
+        path_lock = _path_locks.setdefault(key, threading.RLock())
+
+    with path_lock:    # _lock_depth / _lock_files of this path are only touched by its holder
+        if _lock_depth.get(key, 0) == 0:
+            os.makedirs(os.path.dirname(key), exist_ok=True)
+            fd = os.open(f"{key}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            _lock_files[key] = fd
+        _lock_depth[key] = _lock_depth.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            _lock_depth[key] -= 1
+            if _lock_depth[key] == 0:
+                fd = _lock_files.pop(key)
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+@contextmanager
+def transaction(filepath: str | Path):
+    """
+    Batch many mutations of one JSON file into a single write
+
+    Every read/save/update/delete_key on `filepath` inside the block works on
+    the same in-memory document, which is written once on exit. If the block
+    raises, nothing is written and the changes are discarded. The file stays
+    locked (see _file_lock) for the whole block.
+
+    Example:
+        with js.transaction(SETTINGS_PATH):
+            js.save(SETTINGS_PATH, 'WEBUI.current', 'Forge')
+            js.update(SETTINGS_PATH, 'WEBUI', paths)
+    """
+    key = _cache_key(filepath)
+    with _file_lock(filepath):
+        if _transaction_doc(key) is not None:    # nested transaction joins the outer one
+            yield
+            return
+
+        with _cache_lock:
+            _transactions[key] = (threading.get_ident(), _read_for_write(filepath))
+        try:
+            yield
+        except BaseException:
+            with _cache_lock:
+                _transactions.pop(key)
+                _dirty.discard(key)
+            raise
+
+        with _cache_lock:
+            _, data = _transactions.pop(key)
+        if key in _dirty:
+            _dirty.discard(key)
+            _write_json(filepath, data)
 
 # ==================== Main Functions ====================
 
@@ -160,14 +306,14 @@ def read(*args) -> any:
 
     data = _read_json(filepath)
     if key is None:
-        return data
+        return copy.deepcopy(data)
 
     keys = parse_key(key)
     if not keys:
         return default
 
     result = _get_nested_value(data, keys)
-    return result if result is not None else default
+    return copy.deepcopy(result) if result is not None else default
 
 @validate_args(3, 3)
 def save(*args):
@@ -181,13 +327,56 @@ def save(*args):
     """
     filepath, key, value = args[0], args[1], args[2]
 
-    data = _read_json(filepath)
     keys = parse_key(key)
     if not keys:
         return
 
-    _set_nested_value(data, keys, value)
-    _write_json(filepath, data)
+    with _file_lock(filepath):
+        data = _read_for_write(filepath)
+        _set_nested_value(data, keys, value)
+        _write_json(filepath, data)
+
+@validate_args(2, 3)
+def read_many(*args) -> list:
+    """
+    Read several key paths with a single file access
+
+    Args:
+        filepath (str): Path to JSON file
+        keys (list[str]): Dot-separated key paths
+        default (any, optional): Default for keys not found
+
+    Returns:
+        List of values in the same order as `keys`
+    """
+    filepath, keys = args[0], args[1]
+    default = args[2] if len(args) > 2 else None
+
+    data = _read_json(filepath)
+    values = []
+    for key in keys:
+        parts = parse_key(key)
+        result = _get_nested_value(data, parts) if parts else None
+        values.append(copy.deepcopy(result) if result is not None else default)
+    return values
+
+@validate_args(2, 2)
+def save_many(*args):
+    """
+    Save several values creating full paths, with a single write
+
+    Args:
+        filepath (str): JSON file path
+        mapping (dict): Dot-separated target paths -> values to store
+    """
+    filepath, mapping = args[0], args[1]
+
+    with _file_lock(filepath):
+        data = _read_for_write(filepath)
+        for key, value in mapping.items():
+            if keys := parse_key(key):
+                _set_nested_value(data, keys, value)
+        _write_json(filepath, data)
 
 @validate_args(3, 3)
 def update(*args):
@@ -201,25 +390,26 @@ def update(*args):
     """
     filepath, key, value = args[0], args[1], args[2]
 
-    data = _read_json(filepath)
     keys = parse_key(key)
     if not keys:
         return
 
-    current = data
-    for part in keys[:-1]:
-        current = current.setdefault(part, {})
-
-    last_key = keys[-1]
-    if last_key in current:
-        if isinstance(current[last_key], dict) and isinstance(value, dict):
-            current[last_key].update(value)
+    with _file_lock(filepath):
+        data = _read_for_write(filepath)
+        current = data
+        for part in keys[:-1]:
+            current = current.setdefault(part, {})
+
+        last_key = keys[-1]
+        if last_key in current:
+            if isinstance(current[last_key], dict) and isinstance(value, dict):
+                current[last_key].update(value)
+            else:
+                current[last_key] = value
         else:
-            current[last_key] = value
-    else:
-        logger.warning(f"Key '{'.'.join(keys)}' not found. Update failed.")
+            logger.warning(f"Key '{'.'.join(keys)}' not found. Update failed.")
 
-    _write_json(filepath, data)
+        _write_json(filepath, data)
 
 @validate_args(2, 2)
 def delete_key(*args):
@@ -232,21 +422,22 @@ def delete_key(*args):
     """
     filepath, key = args[0], args[1]
 
-    data = _read_json(filepath)
     keys = parse_key(key)
     if not keys:
         return
 
-    current = data
-    for part in keys[:-1]:
-        current = current.get(part)
-        if not isinstance(current, dict):
-            return
-
-    last_key = keys[-1]
-    if last_key in current:
-        del current[last_key]
-        _write_json(filepath, data)
+    with _file_lock(filepath):
+        data = _read_for_write(filepath)
+        current = data
+        for part in keys[:-1]:
+            current = current.get(part)
+            if not isinstance(current, dict):
+                return
+
+        last_key = keys[-1]
+        if last_key in current:
+            del current[last_key]
+            _write_json(filepath, data)
 
 @validate_args(2, 3)
 def key_exists(*args) -> bool:
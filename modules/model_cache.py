@@ -0,0 +1,189 @@
+""" Model Cache Module | by ANXETY """
+
+from download_manifest import file_sha256    # File Hash
+import json_utils as js                     # JSON
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from pathlib import Path
+import subprocess
+import requests
+import time
+import os
+import re
+
+
+# Constants
+HOME = Path.home()
+SCR_PATH = HOME / 'ANXETY'
+SETTINGS_PATH = SCR_PATH / 'settings.json'
+CACHE_PATH = SCR_PATH / 'cache'
+
+MAX_CACHE_SIZE_GB = js.read(SETTINGS_PATH, 'CACHE.max_size_gb', 40)
+
+MAX_PROBE_WORKERS = 8    # simultaneous HEAD requests for HuggingFace hashes
+
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def normalize_hash(value: Optional[str]) -> Optional[str]:
+    """Return a lowercase SHA256 hex digest or None if the value is not one"""
+    if not value:
+        return None
+    value = value.strip().strip('"').lower()
+    return value if SHA256_RE.match(value) else None
+
+def hf_file_info(url: str, token: str = '') -> tuple[Optional[str], Optional[int]]:
+    """(SHA256, size) of a HuggingFace LFS file from the `x-linked-etag` / `x-linked-size` headers"""
+    headers = {'Authorization': f"Bearer {token}"} if token else {}
+    try:
+        response = requests.head(url, headers=headers, allow_redirects=False, timeout=10)
+        size = response.headers.get('x-linked-size', '')
+        return normalize_hash(response.headers.get('x-linked-etag')), int(size) if size.isdigit() else None
+    except requests.RequestException:
+        return None, None
+
+def hf_file_infos(urls: list[str], token: str = '', max_workers: int = MAX_PROBE_WORKERS) -> dict:
+    """`hf_file_info` for many URLs at once: {url: (sha256, size)}"""
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(urls, executor.map(lambda url: hf_file_info(url, token), urls)))
+
+
+class ModelCache:
+    """
+    Content-addressed blob store shared by every WebUI and session
+
+    Blobs live in `cache/blobs/<sha256>` and are hard-linked into the WebUI
+    model folders, so a file downloaded once costs no extra disk space when
+    it is reused. Where hard links fail (e.g. the folder is on another
+    filesystem) the blob is copied instead. Only blobs that are no longer linked
+    anywhere else count towards the size limit, and those are evicted in
+    least-recently-used order.
+
+    Usage Example:
+        cache = ModelCache()
+        if not cache.link_to(sha256, Path(model_dir) / 'model.safetensors'):
+            ...  # download the file
+            cache.store(sha256, Path(model_dir) / 'model.safetensors')
+    """
+
+    def __init__(self, root: str | Path = CACHE_PATH, max_size_gb: float = MAX_CACHE_SIZE_GB):
+        self.root = Path(root)
+        self.blobs = self.root / 'blobs'
+        self.index_path = self.root / 'index.json'
+        self.max_size = int(max_size_gb * 1024 ** 3)
+        self.blobs.mkdir(parents=True, exist_ok=True)
+
+    def _blob(self, sha256: str) -> Path:
+        return self.blobs / sha256
+
+    def _touch(self, sha256: str, name: str, size: int):
+        js.save(self.index_path, sha256, {'name': name, 'size': size, 'last_used': time.time()})
+
+    @staticmethod
+    def _link(src: Path, dst: Path) -> bool:
+        """Hard-link `src` to `dst`; where that fails (other filesystem) copy it, as a reflink if supported"""
+        tmp = dst.with_name(f".{dst.name}.link")
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(src, tmp)
+        except OSError:
+            result = subprocess.run(['cp', '--reflink=auto', str(src), str(tmp)],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if result.returncode != 0:
+                tmp.unlink(missing_ok=True)
+                return False
+        os.replace(tmp, dst)
+        return True
+
+    def lookup(self, sha256: Optional[str]) -> Optional[Path]:
+        """Return the blob path for a hash if it is cached"""
+        sha256 = normalize_hash(sha256)
+        if sha256 and self._blob(sha256).is_file():
+            return self._blob(sha256)
+        return None
+
+    def link_to(self, sha256: Optional[str], target: str | Path) -> bool:
+        """Materialize a cached blob at `target`. Returns False on a cache miss"""
+        if not (blob := self.lookup(sha256)):
+            return False
+
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() and os.path.samefile(blob, target):
+            linked = True
+        else:
+            linked = self._link(blob, target)
+
+        if linked:
+            self._touch(blob.name, target.name, blob.stat().st_size)
+        return linked
+
+    def store(self, sha256: Optional[str], file: str | Path) -> bool:
+        """Add a finished download to the cache under its hash, once its content matches the hash"""
+        sha256 = normalize_hash(sha256)
+        file = Path(file)
+        if not sha256 or not file.is_file() or Path(f"{file}.aria2").exists():
+            return False
+        if not self.lookup(sha256) and file_sha256(file) != sha256:
+            return False    # a cached blob must never hold the wrong content
+
+        blob = self._blob(sha256)
+        if not blob.exists() and not self._link(file, blob):
+            return False
+
+        self._touch(sha256, file.name, blob.stat().st_size)
+        self.evict()
+        return True
+
+    def blob_inodes(self) -> set:
+        """(st_dev, st_ino) of every cached blob"""
+        inodes = set()
+        for blob in self.blobs.iterdir():
+            stat = blob.stat()
+            inodes.add((stat.st_dev, stat.st_ino))
+        return inodes
+
+    def release(self, inodes: set) -> int:
+        """
+        Drop the blobs behind deleted model files once nothing else links them,
+        so deleting a model really frees its space. Returns the bytes freed
+        """
+        freed = 0
+        for blob in self.blobs.iterdir():
+            stat = blob.stat()
+            if (stat.st_dev, stat.st_ino) in inodes and stat.st_nlink == 1:
+                blob.unlink(missing_ok=True)
+                js.delete_key(self.index_path, blob.name)
+                freed += stat.st_size
+        return freed
+
+    def evict(self, need: int = 0) -> int:
+        """
+        Drop least-recently-used blobs until cache-only data fits the size limit
+        and at least `need` bytes were freed. Returns the bytes freed
+        """
+        index = js.read(self.index_path) or {}
+        entries = []
+        usage = 0
+        freed = 0
+
+        for blob in self.blobs.iterdir():
+            stat = blob.stat()
+            if stat.st_nlink > 1:
+                continue    # still linked into a WebUI folder, costs no extra space
+            usage += stat.st_size
+            entries.append((index.get(blob.name, {}).get('last_used', 0), blob, stat.st_size))
+
+        for _, blob, size in sorted(entries, key=lambda e: e[0]):
+            if usage <= self.max_size and freed >= need:
+                break
+            blob.unlink(missing_ok=True)
+            js.delete_key(self.index_path, blob.name)
+            usage -= size
+            freed += size
+
+        return freed
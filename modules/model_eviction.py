@@ -0,0 +1,119 @@
+""" Model Eviction Module | by ANXETY """
+
+from file_inventory import FileInventory    # File Scanner
+import json_utils as js                     # JSON
+
+from typing import Iterable, Optional
+from pathlib import Path
+import threading
+import shutil
+import time
+import os
+
+
+# Constants
+HOME = Path.home()
+SCR_PATH = HOME / 'ANXETY'
+SETTINGS_PATH = SCR_PATH / 'settings.json'
+USAGE_LOG_PATH = SCR_PATH / 'cache' / 'model_usage.json'
+
+MIN_FREE_GB = js.read(SETTINGS_PATH, 'CACHE.min_free_gb', 5)
+
+MODEL_EXTENSIONS = ('.safetensors', '.ckpt', '.pt', '.pth', '.bin', '.onnx', '.gguf', '.sft')
+
+
+class EvictionPolicy:
+    """
+    Keeps a free-space reserve on the model disk by deleting least-recently-used models
+
+    Only files recorded in a DownloadManifest are candidates, so models the
+    user added by hand are never touched. The last use of a file is the later
+    of its time in the usage log (written on download or cache link) and its
+    atime (updated when a WebUI loads it). Files used during this session and
+    folders behind symlinks (e.g. `GDrive`) are never evicted.
+
+    A model hard-linked into the ModelCache only frees space once its blob is
+    gone too, so cache-only blobs are dropped first and again after each such file.
+
+    Usage Example:
+        eviction = EvictionPolicy([model_dir, lora_dir], manifest, cache=model_cache)
+        eviction.ensure_free(required_bytes)
+        ...  # download
+        eviction.record(model_path)
+    """
+
+    def __init__(self, dirs: Iterable[str | Path], manifest, cache=None, min_free_gb: float = MIN_FREE_GB,
+                 log_path: str | Path = USAGE_LOG_PATH, inventory: Optional[FileInventory] = None):
+        self.dirs = list(dict.fromkeys(os.path.abspath(str(d)) for d in dirs))
+        self.manifest = manifest
+        self.cache = cache
+        self.min_free = int(min_free_gb * 1024 ** 3)
+        self.log_path = Path(log_path)
+        self.usage = js.read(self.log_path, 'files', {}) if self.log_path.exists() else {}
+        self.inventory = inventory or FileInventory()
+        self.started = time.time()
+        self.lock = threading.Lock()
+
+    def _save(self):
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        js.save(self.log_path, 'files', self.usage)
+
+    def record(self, *paths: str | Path):
+        """Mark files as used now"""
+        now = time.time()
+        with self.lock:
+            for path in paths:
+                self.usage[os.path.abspath(str(path))] = now
+            self._save()
+
+    def shortfall(self, required: int = 0) -> int:
+        """Bytes missing to fit `required` bytes and still keep the free-space reserve"""
+        root = next((d for d in self.dirs if os.path.isdir(d)), str(HOME))
+        return required + self.min_free - shutil.disk_usage(root).free
+
+    def candidates(self) -> list[tuple[float, str]]:
+        """(last_used, path) of every evictable model, oldest first"""
+        result = {}
+        for directory in self.dirs:
+            for entry in self.inventory.files(directory, MODEL_EXTENSIONS, follow_symlinks=False):
+                if entry.path in result or os.path.exists(f"{entry.path}.aria2"):
+                    continue
+                if entry.path not in self.manifest.files(os.path.dirname(entry.path)):
+                    continue    # not downloaded by us
+                try:
+                    atime = os.stat(entry.path).st_atime
+                except OSError:
+                    continue
+                last_used = max(self.usage.get(entry.path, 0), atime)
+                if self.usage.get(entry.path, 0) < self.started:
+                    result[entry.path] = last_used
+        return sorted((last_used, path) for path, last_used in result.items())
+
+    def ensure_free(self, required: int = 0) -> list[str]:
+        """Evict least-recently-used models until `required` bytes fit. Returns the deleted paths"""
+        with self.lock:
+            if (short := self.shortfall(required)) <= 0:
+                return []
+
+            if self.cache:
+                self.cache.evict(need=short)    # cache-only blobs are not used by any WebUI
+
+            evicted = []
+            for _, path in self.candidates():
+                if (short := self.shortfall(required)) <= 0:
+                    break
+                try:
+                    linked = os.stat(path).st_nlink > 1
+                    os.remove(path)
+                except OSError:
+                    continue
+
+                evicted.append(path)
+                self.usage.pop(path, None)
+                if linked and self.cache:
+                    self.cache.evict(need=self.shortfall(required))
+
+            if evicted:
+                self._save()
+                self.inventory.save()
+            return evicted
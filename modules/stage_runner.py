@@ -0,0 +1,197 @@
+""" Stage Runner Module | by ANXETY """
+
+from download_engine import cancel_all    # Native Downloader
+
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, Optional
+from dataclasses import dataclass
+import time
+
+try:
+    import psutil    # preinstalled on Colab / Kaggle; without it children are left running on Ctrl-C
+except ImportError:
+    psutil = None
+
+
+# Defaults
+MAX_WORKERS = 6    # stages running at the same time
+
+
+def child_pids() -> set:
+    """PIDs of every process started below this one"""
+    if psutil is None:
+        return set()
+    return {child.pid for child in psutil.Process().children(recursive=True)}
+
+def terminate_children(keep: set = frozenset(), timeout: float = 3):
+    """Terminate (then kill) child processes such as aria2c, tar or git, except the PIDs in `keep`"""
+    if psutil is None:
+        return
+    children = [child for child in psutil.Process().children(recursive=True) if child.pid not in keep]
+    for child in children:
+        try:
+            child.terminate()
+        except psutil.Error:
+            pass
+    _, alive = psutil.wait_procs(children, timeout=timeout)
+    for child in alive:
+        try:
+            child.kill()
+        except psutil.Error:
+            pass
+
+
+@dataclass
+class Stage:
+    """A named unit of setup work and its outcome"""
+    name: str
+    func: Callable[[], None]
+    requires: tuple = ()
+    main_thread: bool = False
+    status: str = 'pending'    # pending | running | done | failed | skipped
+    elapsed: float = 0.0
+    error: Optional[BaseException] = None
+
+
+class StageRunner:
+    """
+    Runs setup stages as a dependency graph
+
+    Every stage starts as soon as all stages it requires are done, so
+    independent network-bound work (venv, WebUI archive, models) overlaps.
+    A failed stage skips everything that depends on it; stages added with
+    `when=False` count as done so their dependents still run.
+
+    Stages run on worker threads: they must not change the working directory
+    or capture the global stdout. Stages added with `main_thread=True` (e.g.
+    ones that prompt or capture output) run on the calling thread instead,
+    while the worker stages keep going. An interrupt (Ctrl-C) cancels the pending
+    stages, stops native downloads, terminates the child processes started by
+    the running ones and returns at once instead of waiting for them.
+
+    Usage Example:
+        runner = StageRunner()
+        runner.add('venv', setup_venv)
+        runner.add('dirs', make_dirs)
+        runner.add('models', download_models, requires=['dirs'])
+        runner.run()
+        runner.print_timings()
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self.stages: dict[str, Stage] = {}
+        self.elapsed = 0.0
+
+    def add(self, name: str, func: Callable[[], None], requires: Iterable[str] = (), when: bool = True,
+            main_thread: bool = False):
+        """Register a stage; `when=False` registers it as already satisfied"""
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already registered")
+        stage = Stage(name, func, tuple(requires), main_thread)
+        if not when:
+            stage.status = 'skipped'
+        self.stages[name] = stage
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dep in stage.requires:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' requires unknown stage '{dep}'")
+
+        # Kahn's algorithm: every stage must become reachable
+        remaining = {name: set(stage.requires) for name, stage in self.stages.items()}
+        while ready := [name for name, deps in remaining.items() if not deps]:
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        if remaining:
+            raise ValueError(f"Dependency cycle between stages: {', '.join(remaining)}")
+
+    def _ready(self, stage: Stage) -> Optional[bool]:
+        """True if runnable, False if blocked by a failure, None if still waiting"""
+        states = [self.stages[dep].status for dep in stage.requires]
+        if 'failed' in states or 'blocked' in states:
+            return False
+        if all(state in ('done', 'skipped') for state in states):
+            return True
+        return None
+
+    @staticmethod
+    def _execute(stage: Stage):
+        start = time.monotonic()
+        try:
+            stage.func()
+            stage.status = 'done'
+        except BaseException as e:
+            stage.status = 'failed'
+            stage.error = e
+        finally:
+            stage.elapsed = time.monotonic() - start
+
+    @staticmethod
+    def _report(stage: Stage):
+        if stage.status == 'failed':
+            print(f"\n\033[31m[Error]:\033[0m stage '{stage.name}' failed: {stage.error}")
+
+    def run(self) -> bool:
+        """Run every stage; returns False if any stage failed"""
+        self._validate()
+        start = time.monotonic()
+        running = {}
+        known_children = child_pids()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='stage')
+
+        try:
+            while True:
+                ran_inline = False
+                for stage in self.stages.values():
+                    if stage.status != 'pending':
+                        continue
+                    ready = self._ready(stage)
+                    if ready and stage.main_thread:
+                        stage.status = 'running'
+                        self._execute(stage)
+                        if isinstance(stage.error, KeyboardInterrupt):
+                            raise stage.error
+                        self._report(stage)
+                        ran_inline = True
+                    elif ready:
+                        stage.status = 'running'
+                        running[executor.submit(self._execute, stage)] = stage
+                    elif ready is False:
+                        stage.status = 'blocked'
+
+                if ran_inline:
+                    continue    # its dependents may be ready now
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    self._report(running.pop(future))
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            cancel_all()
+            terminate_children(known_children)
+            raise
+        finally:
+            self.elapsed = time.monotonic() - start
+
+        executor.shutdown()
+        return not any(stage.status in ('failed', 'blocked') for stage in self.stages.values())
+
+    def print_timings(self):
+        """Print how long every stage took and the overall wall time"""
+        icons = {'done': '✅', 'failed': '❌', 'blocked': '⛔', 'skipped': '⏭️'}
+        width = max((len(name) for name in self.stages), default=0)
+
+        print('\033[33m⏱️ Stage timings:\033[0m')
+        for stage in self.stages.values():
+            minutes, seconds = divmod(stage.elapsed, 60)
+            timing = f"{int(minutes):02}:{seconds:05.2f}" if stage.status in ('done', 'failed') else stage.status
+            print(f"  {icons.get(stage.status, '•')} {stage.name:<{width}}  {timing}")
+
+        busy = sum(stage.elapsed for stage in self.stages.values())
+        print(f"  Total: \033[32m{self.elapsed:.1f}s\033[0m (sequential would be ~{busy:.1f}s)")
@@ -20,15 +20,15 @@ WEBUI_PATHS = {
 
 def update_current_webui(current_value):
     """Update the current WebUI value and save it."""
-    current_stored_value = js.read(SETTINGS_PATH, 'WEBUI.current')
-    latest_value = js.read(SETTINGS_PATH, 'WEBUI.latest', None)
+    with js.transaction(SETTINGS_PATH):
+        current_stored_value, latest_value = js.read_many(SETTINGS_PATH, ['WEBUI.current', 'WEBUI.latest'])
 
-    if latest_value is None or current_stored_value != current_value:
-        js.save(SETTINGS_PATH, 'WEBUI.latest', current_stored_value)
-        js.save(SETTINGS_PATH, 'WEBUI.current', current_value)
+        if latest_value is None or current_stored_value != current_value:
+            js.save(SETTINGS_PATH, 'WEBUI.latest', current_stored_value)
+            js.save(SETTINGS_PATH, 'WEBUI.current', current_value)
 
-    js.save(SETTINGS_PATH, 'WEBUI.webui_path', str(HOME / current_value))
-    _set_webui_paths(current_value)
+        js.save(SETTINGS_PATH, 'WEBUI.webui_path', str(HOME / current_value))
+        _set_webui_paths(current_value)
 
 def _set_webui_paths(ui):
     """Set web UI paths based on the selected UI."""
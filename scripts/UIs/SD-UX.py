@@ -1,10 +1,9 @@
 # ~ SD-UX.py | by ANXETY ~
 
-from Manager import m_download, m_clone    # Every Download | Clone
-import json_utils as js                    # JSON
+from Manager import m_download_zip, m_clone    # Every Download | Clone
+import json_utils as js                        # JSON
 
 from IPython.display import clear_output
-from IPython.utils import capture
 from IPython import get_ipython
 from pathlib import Path
 import subprocess
@@ -12,7 +11,6 @@ import asyncio
 import os
 
 
-CD = os.chdir
 ipySys = get_ipython().system
 
 # Constants
@@ -23,13 +21,9 @@ WEBUI = HOME / UI
 SCR_PATH = HOME / 'ANXETY'
 SETTINGS_PATH = SCR_PATH / 'settings.json'
 
-ENV_NAME = js.read(SETTINGS_PATH, 'ENVIRONMENT.env_name')
+ENV_NAME, BRANCH, EXTS = js.read_many(SETTINGS_PATH, ['ENVIRONMENT.env_name', 'ENVIRONMENT.branch', 'WEBUI.extension_dir'])
 
 REPO_URL = f"https://huggingface.co/NagisaNao/ANXETY/resolve/main/{UI}.zip"
-BRANCH = js.read(SETTINGS_PATH, 'ENVIRONMENT.branch')
-EXTS = js.read(SETTINGS_PATH, 'WEBUI.extension_dir')
-
-CD(HOME)
 
 
 ## ================== WEB UI OPERATIONS ==================
@@ -103,26 +97,23 @@ async def download_configuration():
         extensions_list.append('https://github.com/gutris1/sd-encrypt-image Encrypt-Image')
 
     os.makedirs(EXTS, exist_ok=True)
-    CD(EXTS)
 
     tasks = []
     for command in extensions_list:
         tasks.append(asyncio.create_subprocess_shell(
             f"git clone --depth 1 {command}",
+            cwd=EXTS,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL
         ))
 
-    await asyncio.gather(*tasks)
+    processes = await asyncio.gather(*tasks)
+    await asyncio.gather(*(process.wait() for process in processes))
 
 def unpack_webui():
-    zip_path = f"{HOME}/{UI}.zip"
-    m_download(f"{REPO_URL} {HOME} {UI}.zip")
-    ipySys(f"unzip -q -o {zip_path} -d {WEBUI}")
-    ipySys(f"rm -rf {zip_path}")
+    m_download_zip(REPO_URL, WEBUI)
 
 ## ====================== MAIN CODE ======================
 if __name__ == '__main__':
-    with capture.capture_output():
-        unpack_webui()
-        asyncio.run(download_configuration())
\ No newline at end of file
+    unpack_webui()
+    asyncio.run(download_configuration())
\ No newline at end of file
@@ -1,11 +1,15 @@
 # ~ auto-cleaner.py | by ANXETY ~
 
 from widget_factory import WidgetFactory    # WIDGETS
+from file_inventory import FileInventory    # File Scanner
+from model_cache import ModelCache          # Model Cache
 import json_utils as js                     # JSON
 
 from IPython.display import display, HTML, clear_output
 import ipywidgets as widgets
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import threading
 import psutil
 import json
 import time
@@ -26,11 +30,8 @@ cleaner_css = CSS / 'auto-cleaner.css'
 def load_settings(path):
     """Load settings from a JSON file."""
     try:
-        return {
-            **js.read(path, 'ENVIRONMENT'),
-            **js.read(path, 'WIDGETS'),
-            **js.read(path, 'WEBUI')
-        }
+        sections = js.read_many(path, ['ENVIRONMENT', 'WIDGETS', 'WEBUI'], {})
+        return {key: value for section in sections for key, value in section.items()}
     except (json.JSONDecodeError, IOError) as e:
         print(f"Error loading settings: {e}")
         return {}
@@ -41,60 +42,141 @@ locals().update(settings)
 
 ## ================= AutoCleaner function ================
 
-def _update_memory_info():
-    disk_space = psutil.disk_usage(os.getcwd())
-    total = disk_space.total / (1024 ** 3)
-    used = disk_space.used / (1024 ** 3)
-    free = disk_space.free / (1024 ** 3)
-
-    storage_info.value = f'''
-    <div class="storage_info">Total storage: {total:.2f} GB <span style="color: #555">|</span> Used: {used:.2f} GB <span style="color: #555">|</span> Free: {free:.2f} GB</div>
-    '''
+CLEAN_WORKERS = 8                  # parallel deletions
+PROGRESS_INTERVAL = 0.25           # min seconds between storage panel updates
 
-def clean_directory(directory, directory_type):
-    trash_extensions = {'.txt', '.aria2', '.ipynb_checkpoints'}
-    image_extensions = {'.png', '.jpg', '.jpeg', '.gif'}
-    deleted_files = 0
+TRASH_EXTENSIONS = {'.txt', '.aria2', '.ipynb_checkpoints'}
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif'}
 
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            file_path = os.path.join(root, file)
+def _format_size(size):
+    if size >= 1024 ** 3:
+        return f"{size / 1024 ** 3:.2f} GB"
+    return f"{size / 1024 ** 2:.1f} MB"
 
-            if directory_type == 'Models' and file.endswith(tuple(image_extensions)):
-                os.remove(file_path)
-                continue
+def _storage_html(total, used, free):
+    return f'''
+    <div class="storage_info">Total storage: {total:.2f} GB <span style="color: #555">|</span> Used: {used:.2f} GB <span style="color: #555">|</span> Free: {free:.2f} GB</div>
+    '''
 
-            if not file.endswith(tuple(trash_extensions)) and '.' in file:
-                deleted_files += 1
+def _update_memory_info(freed=0):
+    """Show the disk snapshot adjusted by the bytes freed since it was taken"""
+    freed += freed_total
+    gb = 1024 ** 3
+    storage_info.value = _storage_html(disk_space.total / gb, (disk_space.used - freed) / gb, (disk_space.free + freed) / gb)
+
+def _freeable(path, blob_inodes):
+    """
+    Bytes deleting a file gives back: downloaded models are often hard links to a
+    cache blob, which is released with them; other extra links keep the data alive
+    """
+    try:
+        stat = os.lstat(path)
+    except OSError:
+        return 0
+    if stat.st_nlink == 1 or (stat.st_nlink == 2 and (stat.st_dev, stat.st_ino) in blob_inodes):
+        return stat.st_size
+    return 0
+
+def build_plan(selected):
+    """Deletion plan per category: {category: {'files': [...], 'count': n, 'bytes': freed bytes}}"""
+    blob_inodes = model_cache.blob_inodes()
+    plan = {}
+    for option in selected:
+        if option not in directories:
+            continue
+
+        files = inventory.files(directories[option], follow_symlinks=False)    # never delete through GDrive links
+        counted = [
+            entry for entry in files
+            if not entry.name.endswith(tuple(TRASH_EXTENSIONS)) and '.' in entry.name
+            and not (option == 'Models' and entry.name.endswith(tuple(IMAGE_EXTENSIONS)))
+        ]
+        plan[option] = {
+            'files': files,
+            'count': len(counted),
+            'bytes': sum(_freeable(entry.path, blob_inodes) for entry in files)
+        }
+    return plan
 
-            os.remove(file_path)
+def _remove_file(path):
+    """Delete one file; returns (bytes freed, inode if the data is still linked elsewhere)"""
+    try:
+        stat = os.lstat(path)
+        os.remove(path)
+    except FileNotFoundError:
+        return 0, None
+    if stat.st_nlink == 1:
+        return stat.st_size, None
+    return 0, (stat.st_dev, stat.st_ino)
+
+def _remove_empty_dirs(root):
+    """Remove empty subdirectories bottom-up, keeping `root` and never entering symlinks"""
+    for path, dirs, files in os.walk(root, topdown=False):
+        if path != root and not os.listdir(path):
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+
+def execute_plan(plan):
+    """Delete every planned file in a thread pool, updating the storage panel as bytes are freed"""
+    global freed_total
+    freed = 0
+    last_update = 0
+    linked = set()
+    jobs = [entry.path for category in plan.values() for entry in category['files']]
+
+    with ThreadPoolExecutor(max_workers=CLEAN_WORKERS) as executor:
+        for size, inode in executor.map(_remove_file, jobs):
+            freed += size
+            if inode:
+                linked.add(inode)
+            if time.monotonic() - last_update >= PROGRESS_INTERVAL:
+                last_update = time.monotonic()
+                _update_memory_info(freed)
+
+    freed += model_cache.release(linked)    # cache blobs of deleted models
+
+    for option in plan:
+        _remove_empty_dirs(directories[option])
+        inventory.forget(directories[option])
+    inventory.save()
+
+    freed_total += freed
+    _update_memory_info()
+    return freed
 
-    return deleted_files
+def _show_messages(messages):
+    output.clear_output()
+    for message in messages:
+        output.append_display_data(HTML(f'<p class="output_message animated_message">{message}</p>'))
 
-def generate_messages(deleted_files_dict):
-    messages = []
+def _set_buttons_disabled(disabled):
+    for button in (execute_button, preview_button):
+        button.disabled = disabled
 
-    for key, value in deleted_files_dict.items():
-        object_word = key
-        messages.append(f"Deleted {value} {object_word}")
-    return messages
+def preview_button_press(button):
+    plan = build_plan(auto_cleaner_widget.value)
+    _show_messages(
+        [f"Will delete {info['count']} {option}, freeing {_format_size(info['bytes'])}" for option, info in plan.items()]
+        or ['Nothing selected']
+    )
 
 def execute_button_press(button):
-    selected_cleaners = auto_cleaner_widget.value
-    deleted_files_dict = {}
-
-    for option in selected_cleaners:
-        if option in directories:
-            deleted_files_dict[option] = clean_directory(directories[option], option)
+    plan = build_plan(auto_cleaner_widget.value)
+    if not plan:
+        return
 
-    output.clear_output()
-
-    with output:
-        for message in generate_messages(deleted_files_dict):
-            message_widget = HTML(f'<p class="output_message animated_message">{message}</p>')
-            display(message_widget)
+    def run():
+        try:
+            freed = execute_plan(plan)
+            _show_messages([f"Deleted {info['count']} {option}" for option, info in plan.items()] + [f"Freed {_format_size(freed)}"])
+        finally:
+            _set_buttons_disabled(False)
 
-    _update_memory_info()
+    _set_buttons_disabled(True)
+    _show_messages(['Cleaning...'])
+    threading.Thread(target=run, daemon=True).start()    # keep the widget responsive
 
 def hide_button_press(button):
     factory.close(container, class_names=['hide'], delay=0.5)
@@ -103,6 +185,8 @@ def hide_button_press(button):
 
 # Initialize the WidgetFactory
 factory = WidgetFactory()
+inventory = FileInventory()
+model_cache = ModelCache()
 HR = widgets.HTML('<hr>')
 
 # Load Css
@@ -118,9 +202,7 @@ directories = {
 
 # --- storage memory ---
 disk_space = psutil.disk_usage(os.getcwd())
-total = disk_space.total / (1024 ** 3)
-used = disk_space.used / (1024 ** 3)
-free = disk_space.free / (1024 ** 3)
+freed_total = 0    # bytes deleted since the snapshot
 
 # UI Code
 clean_options = list(directories.keys())
@@ -132,17 +214,18 @@ auto_cleaner_widget = factory.create_select_multiple(clean_options, '', [], layo
 output = widgets.Output().add_class('output_panel')
 # ---
 execute_button = factory.create_button('Execute Cleaning', class_names=['button_execute', 'cleaner_button'])
+preview_button = factory.create_button('Preview', class_names=['button_preview', 'cleaner_button'])
 hide_button = factory.create_button('Hide Widget', class_names=['button_hide', 'cleaner_button'])
 
 # Button Click
 execute_button.on_click(execute_button_press)
+preview_button.on_click(preview_button_press)
 hide_button.on_click(hide_button_press)
 # ---
-storage_info = factory.create_html(f'''
-<div class="storage_info">Total storage: {total:.2f} GB <span style="color: #555">|</span> Used: {used:.2f} GB <span style="color: #555">|</span> Free: {free:.2f} GB</div>
-''')
+storage_info = factory.create_html('')
+_update_memory_info()
 # ---
-buttons = factory.create_hbox([execute_button, hide_button])
+buttons = factory.create_hbox([execute_button, preview_button, hide_button])
 lower_information_panel = factory.create_hbox([buttons, storage_info], class_names=['lower_information_panel'])
 
 # Create a horizontal layout for the selection and output areas
@@ -1,6 +1,7 @@
 # ~ download-result.py | by ANXETY ~
 
 from widget_factory import WidgetFactory    # WIDGETS
+from file_inventory import FileInventory    # File Scanner
 import json_utils as js                     # JSON
 
 import ipywidgets as widgets
@@ -27,11 +28,8 @@ widgets_css = CSS / 'download-result.css'
 def load_settings(path):
     """Load settings from a JSON file."""
     try:
-        return {
-            **js.read(path, 'ENVIRONMENT'),
-            **js.read(path, 'WIDGETS'),
-            **js.read(path, 'WEBUI')
-        }
+        sections = js.read_many(path, ['ENVIRONMENT', 'WIDGETS', 'WEBUI'], {})
+        return {key: value for section in sections for key, value in section.items()}
     except (json.JSONDecodeError, IOError) as e:
         print(f"Error loading settings: {e}")
         return {}
@@ -47,6 +45,7 @@ HEADER_DL = 'DOWNLOAD RESULTS'
 VERSION = 'v0.58'
 
 factory = WidgetFactory()
+inventory = FileInventory()
 
 # Load CSS
 factory.load_css(widgets_css)
@@ -67,18 +66,10 @@ def output_container_generator(header, items, is_grid=False):
 
 def get_all_files_list(directory, extensions, excluded_dirs=[]):
     """Get all files in the directory and its subdirectories, excluding specified directories."""
-    if not os.path.isdir(directory):
-        return []
-
-    files_list = []
-    for root, dirs, files in os.walk(directory, followlinks=True):
-        # Exclude specified directories
-        dirs[:] = [d for d in dirs if d not in excluded_dirs]
-
-        for file in files:
-            if file.endswith(extensions) and not file.endswith(tuple(EXCLUDED_EXTENSIONS)):
-                files_list.append(file)  # Store only the file name
-    return files_list
+    return [
+        entry.name for entry in inventory.files(directory, extensions, excluded_dirs)    # Store only the file name
+        if not entry.name.endswith(tuple(EXCLUDED_EXTENSIONS))
+    ]
 
 def get_folders_list(directory):
     """List folders in a directory, excluding hidden folders."""
@@ -144,6 +135,8 @@ diffusions_widget = output_container_generator('Diffusions', diffusions_list)
 controlnets_list = get_controlnets_list(control_dir, r'^[^_]*_[^_]*_[^_]*_(.*)_fp16\.safetensors')
 controlnets_widget = output_container_generator('ControlNets', controlnets_list)
 
+inventory.save()
+
 ## Sorting and Output
 widgets_dict = {
     models_widget: models_list,
@@ -1,9 +1,15 @@
 # ~ download.py | by ANXETY ~
 
-from webui_utils import handle_setup_timer    # WEBUI
-from CivitaiAPI import CivitAiAPI             # CivitAI API
-from Manager import m_download                # Every Download
-import json_utils as js                       # JSON
+from model_cache import ModelCache, hf_file_infos  # Model Cache
+from model_eviction import EvictionPolicy          # Disk Quota
+from download_manifest import DownloadManifest     # Finished Downloads
+from webui_utils import handle_setup_timer         # WEBUI
+from stage_runner import StageRunner               # Stages
+from CivitaiAPI import CivitAiAPI                  # CivitAI API
+from Manager import m_download, m_download_pipe    # Every Download
+from Manager import probe_sizes                    # Download Sizes
+from Manager import m_update, m_clone_repos        # Git Update | Clone
+import json_utils as js                            # JSON
 
 from IPython.display import clear_output
 from IPython.utils import capture
@@ -12,6 +18,7 @@ from IPython import get_ipython
 from datetime import timedelta
 from pathlib import Path
 import subprocess
+import threading
 import requests
 import zipfile
 import shutil
@@ -23,7 +30,6 @@ import re
 import os
 
 
-CD = os.chdir
 ipySys = get_ipython().system
 ipyRun = get_ipython().run_line_magic
 
@@ -34,10 +40,9 @@ SCR_PATH = Path(HOME / 'ANXETY')
 SCRIPTS = SCR_PATH / 'scripts'
 SETTINGS_PATH = SCR_PATH / 'settings.json'
 
-LANG = js.read(SETTINGS_PATH, 'ENVIRONMENT.lang')
-ENV_NAME = js.read(SETTINGS_PATH, 'ENVIRONMENT.env_name')
-UI = js.read(SETTINGS_PATH, 'WEBUI.current')
-WEBUI = js.read(SETTINGS_PATH, 'WEBUI.webui_path')
+LANG, ENV_NAME, UI, WEBUI = js.read_many(SETTINGS_PATH, [
+    'ENVIRONMENT.lang', 'ENVIRONMENT.env_name', 'WEBUI.current', 'WEBUI.webui_path'
+])
 
 
 ## =================== LIBRARIES | VENV ==================
@@ -50,15 +55,20 @@ def install_dependencies(commands):
         except Exception:
             pass
 
-def setup_venv():
+def _lz4_decoder():
+    """Streaming lz4 frame decoder from the Python package, if installed."""
+    try:
+        import lz4.frame
+        return lz4.frame.LZ4FrameDecompressor().decompress
+    except ImportError:
+        return None
+
+def setup_venv(log=True):
     """Customize the virtual environment using the specified URL."""
-    CD(HOME)
     url = "https://huggingface.co/NagisaNao/ANXETY/resolve/main/python31017-venv-torch251-cu121-C-fca.tar.lz4"
     fn = Path(url).name
 
-    m_download(f"{url} {HOME} {fn}")
-
-    # Install dependencies based on environment
+    # Install dependencies based on environment, alongside the download
     install_commands = []
     if ENV_NAME == 'Kaggle':
         install_commands.extend([
@@ -67,11 +77,26 @@ def setup_venv():
         ])
 
     install_commands.append('sudo apt-get -y install lz4 pv')
-    install_dependencies(install_commands)
+    installer = threading.Thread(target=install_dependencies, args=(install_commands,), daemon=True)
+    installer.start()
+
+    # Stream HTTP -> lz4 -> tar straight into HOME; wait for apt only if no decoder is available yet
+    decoder = None if shutil.which('lz4') else _lz4_decoder()
+    if decoder:
+        command = ['tar', 'xf', '-', '-C', str(HOME)]
+    else:
+        if not shutil.which('lz4'):
+            installer.join()
+        command = ['sh', '-c', f"lz4 -d | tar xf - -C {HOME}"]
 
-    # Unpack and clean
-    ipySys(f"pv {fn} | lz4 -d | tar xf -")
-    Path(fn).unlink()
+    streamed = m_download_pipe(url, command, decoder=decoder, log=log)
+    installer.join()
+
+    if not streamed:
+        # Fallback: download the archive, then unpack and clean
+        m_download(f"{url} {HOME} {fn}")
+        subprocess.run(['sh', '-c', f"lz4 -d -c {HOME / fn} | tar xf - -C {HOME}"])
+        (HOME / fn).unlink(missing_ok=True)
 
     BIN = str(VENV / 'bin')
     PKG = str(VENV / 'lib/python3.10/site-packages')
@@ -95,8 +120,11 @@ def install_packages(install_lib):
         except Exception:
             pass
 
-# Check and install dependencies
-if not js.key_exists(SETTINGS_PATH, 'ENVIRONMENT.install_deps', True):
+def install_libraries():
+    """Install the libraries and tunnel binaries once per environment."""
+    if js.key_exists(SETTINGS_PATH, 'ENVIRONMENT.install_deps', True):
+        return
+
     install_lib = {
         ## Libs
         'aria2': "pip install aria2",
@@ -110,24 +138,20 @@ if not js.key_exists(SETTINGS_PATH, 'ENVIRONMENT.install_deps', True):
 
     print('💿 Installing the libraries will take a bit of time.')
     install_packages(install_lib)
-    clear_output()
+    print()
     js.update(SETTINGS_PATH, 'ENVIRONMENT.install_deps', True)
 
-if not os.path.exists(VENV):
+def restore_venv():
     print('♻️ Installing VENV, this will take some time...')
-    setup_venv()
-    clear_output()
+    setup_venv(log=False)
 
 ## ================ loading settings V5 ==================
 
 def load_settings(path):
     """Load settings from a JSON file."""
     try:
-        return {
-            **js.read(path, 'ENVIRONMENT'),
-            **js.read(path, 'WIDGETS'),
-            **js.read(path, 'WEBUI')
-        }
+        sections = js.read_many(path, ['ENVIRONMENT', 'WIDGETS', 'WEBUI'], {})
+        return {key: value for section in sections for key, value in section.items()}
     except (json.JSONDecodeError, IOError) as e:
         print(f"Error loading settings: {e}")
         return {}
@@ -138,7 +162,12 @@ locals().update(settings)
 
 ## ======================== WEBUI ========================
 
-if UI not in ['ComfyUI', 'Forge', 'ReForge'] and not os.path.exists('/root/.cache/huggingface/hub/models--Bingsu--adetailer'):
+# Decided up front: the model folders are created inside WEBUI while it is still unpacking
+webui_missing = not os.path.exists(WEBUI)
+adetailer_cache_missing = UI not in ['ComfyUI', 'Forge', 'ReForge'] and not os.path.exists('/root/.cache/huggingface/hub/models--Bingsu--adetailer')
+start_timer = js.read(SETTINGS_PATH, 'ENVIRONMENT.start_timer')
+
+def unpack_adetailer_cache():
     print('🚚 Unpacking ADetailer model cache...')
 
     name_zip = 'hf_cache_adetailer'
@@ -146,79 +175,63 @@ if UI not in ['ComfyUI', 'Forge', 'ReForge'] and not os.path.exists('/root/.cach
 
     zip_path = f"{HOME}/{name_zip}.zip"
     m_download(f"{chache_url} {HOME} {name_zip}")
-    ipySys(f"unzip -q -o {zip_path} -d /")
-    ipySys(f"rm -rf {zip_path}")
+    subprocess.run(['unzip', '-q', '-o', zip_path, '-d', '/'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    Path(zip_path).unlink(missing_ok=True)
 
-    clear_output()
-
-start_timer = js.read(SETTINGS_PATH, 'ENVIRONMENT.start_timer')
-
-if not os.path.exists(WEBUI):
+def unpack_webui():
     start_install = time.time()
-    print(f"⌚ Unpacking Stable Diffusion... | WEBUI: \033[34m{UI}\033[0m", end='')
+    print(f"⌚ Unpacking Stable Diffusion... | WEBUI: \033[34m{UI}\033[0m")
 
     ipyRun('run', f"{SCRIPTS}/UIs/{UI}.py")
     handle_setup_timer(WEBUI, start_timer)		# Setup timer (for timer-extensions)
 
     install_time = time.time() - start_install
     minutes, seconds = divmod(int(install_time), 60)
-    print(f"\r🚀 Unpacking \033[34m{UI}\033[0m is complete! {minutes:02}:{seconds:02} ⚡" + ' '*25)
-
-else:
-    print(f"🔧 Current WebUI: \033[34m{UI}\033[0m")
-    print('🚀 Unpacking is complete. Pass. ⚡')
-
-    timer_env = handle_setup_timer(WEBUI, start_timer)
-    elapsed_time = str(timedelta(seconds=time.time() - timer_env)).split('.')[0]
-    print(f"⌚️ Session duration: \033[33m{elapsed_time}\033[0m")
+    print(f"🚀 Unpacking \033[34m{UI}\033[0m is complete! {minutes:02}:{seconds:02} ⚡")
 
+def _git(*args, cwd=WEBUI):
+    subprocess.run(['git', *args], cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 ## Changes extensions and WebUi
-if latest_webui or latest_extensions:
+def update_webui():
     action = 'WebUI and Extensions' if latest_webui and latest_extensions else ('WebUI' if latest_webui else 'Extensions')
-    print(f"⌚️ Update {action}...", end='')
-    with capture.capture_output():
-        ipySys('git config --global user.email "you@example.com"')
-        ipySys('git config --global user.name "Your Name"')
+    print(f"⌚️ Update {action}...")
+    _git('config', '--global', 'user.email', 'you@example.com')
+    _git('config', '--global', 'user.name', 'Your Name')
 
-        ## Update Webui
-        if latest_webui:
-            CD(WEBUI)
-            # ipySys('git restore .')
-            # ipySys('git pull -X theirs --rebase --autostash')
+    ## Update Webui
+    if latest_webui:
+        # _git('restore', '.')
+        # _git('pull', '-X', 'theirs', '--rebase', '--autostash')
 
-            ipySys('git stash push --include-untracked')
-            ipySys('git pull --rebase')
-            ipySys('git stash pop')
+        _git('stash', 'push', '--include-untracked')
+        _git('pull', '--rebase')
+        _git('stash', 'pop')
 
-        ## Update extensions
-        if latest_extensions:
-            # ipySys('{\'for dir in \' + WEBUI + \'/extensions/*/; do cd \\'$dir\\' && git reset --hard && git pull; done\'}')
-            for entry in os.listdir(f"{WEBUI}/extensions"):
-                dir_path = f"{WEBUI}/extensions/{entry}"
-                if os.path.isdir(dir_path):
-                    subprocess.run(['git', 'reset', '--hard'], cwd=dir_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    subprocess.run(['git', 'pull'], cwd=dir_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    ## Update extensions (concurrent shallow fetch + reset)
+    if latest_extensions:
+        extensions = [entry.path for entry in os.scandir(f"{WEBUI}/extensions") if entry.is_dir()]
+        m_update(extensions, log=True)
 
-    print(f"\r✨ Update {action} Completed!")
+    print(f"✨ Update {action} Completed!")
 
 
 # === FIXING EXTENSIONS ===
-with capture.capture_output():
+def fix_extensions():
     # --- Umi-Wildcard ---
-    ipySys("sed -i '521s/open=\\(False\\|True\\)/open=False/' {WEBUI}/extensions/Umi-AI-Wildcards/scripts/wildcard_recursive.py")    # Closed accordion by default
+    wildcard_script = f"{WEBUI}/extensions/Umi-AI-Wildcards/scripts/wildcard_recursive.py"
+    if os.path.exists(wildcard_script):
+        subprocess.run(['sed', '-i', '521s/open=\\(False\\|True\\)/open=False/', wildcard_script])    # Closed accordion by default
 
 
 ## Version switching
-if commit_hash:
-    print('🔄 Switching to the specified version...', end='')
-    with capture.capture_output():
-        CD(WEBUI)
-        ipySys('git config --global user.email "you@example.com"')
-        ipySys('git config --global user.name "Your Name"')
-        ipySys('git reset --hard {commit_hash}')
-        ipySys('git pull origin {commit_hash}')    # Get last changes in branch
-    print(f"\r🔄 Switch complete! Current commit: \033[34m{commit_hash}\033[0m")
+def switch_version():
+    print('🔄 Switching to the specified version...')
+    _git('config', '--global', 'user.email', 'you@example.com')
+    _git('config', '--global', 'user.name', 'Your Name')
+    _git('reset', '--hard', commit_hash)
+    _git('pull', 'origin', commit_hash)    # Get last changes in branch
+    print(f"🔄 Switch complete! Current commit: \033[34m{commit_hash}\033[0m")
 
 
 # === Google Drive Mounting | EXCLUSIVE for Colab ===
@@ -337,8 +350,6 @@ def handle_gdrive(mount_flag, log=False):
             except Exception as e:
                 print(f"❌ Unmount error: {str(e)}\n")
 
-handle_gdrive(mountGDrive)
-
 
 # Get XL or 1.5 models list
 ## model_list | vae_list | controlnet_list
@@ -347,8 +358,6 @@ with open(f"{SCRIPTS}/{model_files}") as f:
     exec(f.read())
 
 ## Downloading model and stuff | oh~ Hey! If you're freaked out by that code too, don't worry, me too!
-print('📦 Downloading models and stuff...', end='')
-
 extension_repo = []
 PREFIX_MAP = {
     # prefix : (dir_path , short-tag)
@@ -368,8 +377,15 @@ PREFIX_MAP = {
     'diffusion': (diffusion_dir, '$diff'),
     'config': (config_dir, '$cfg')
 }
-for dir_path, _ in PREFIX_MAP.values():
-    os.makedirs(dir_path, exist_ok=True)
+
+def make_model_dirs():
+    for dir_path, _ in PREFIX_MAP.values():
+        os.makedirs(dir_path, exist_ok=True)
+
+def prepare_model_dirs():
+    """Model folders and their GDrive links, only once the WebUI is unpacked (a WEBUI folder counts as installed)."""
+    make_model_dirs()
+    handle_gdrive(mountGDrive)    # may prompt and captures stdout: runs on the main thread
 
 ''' Formatted Info Output '''
 
@@ -434,7 +450,9 @@ def _process_download_link(link):
             return prefix, re.sub(r'\[.*?\]', '', path), _extract_filename(path)
     return None, link, None
 
-def download(line):
+def collect_download_items(line):
+    """Split the download line into (url, dst_dir, file_name) items; extensions go to `extension_repo`."""
+    items = []
     for link in (l.strip() for l in line.split(',') if l.strip()):
         prefix, url, filename = _process_download_link(link)
 
@@ -443,43 +461,143 @@ def download(line):
             if prefix == 'extension':
                 extension_repo.append((url, filename))
             else:
-                try:
-                    manual_download(url, dir_path, filename, prefix)
-                except Exception as e:
-                    print(f"\n> Error downloading file: {e}")
+                items.append((url, dir_path, filename))
         else:
             url, dst_dir, file_name = url.split()
-            manual_download(url, dst_dir, file_name)
+            items.append((url, dst_dir, file_name))
+
+    return items
 
+def download(items):
+    manual_download(items)
     _unpack_zips()
 
-def manual_download(url, dst_dir, file_name=None, prefix=None):
+model_cache = ModelCache()
+manifest = DownloadManifest()
+eviction = EvictionPolicy([d for p, (d, _) in PREFIX_MAP.items() if p not in ('extension', 'config')], manifest, cache=model_cache)
+civitai = CivitAiAPI(civitai_token)
+
+def _make_room(sizes):
+    """Evict least-recently-used models if the transfers would eat into the free-space reserve."""
+    for path in eviction.ensure_free(sum(size for size in sizes.values() if size)):
+        print(f"\033[33m[Disk]:\033[0m Evicted least-recently-used model: {path}")
+
+def _is_downloaded(url, dst_dir, file_name):
+    """
+    Check the folder manifest; with `revalidate_downloads` the recorded SHA256 is checked too.
+    A finished file is marked as used, so the eviction of this run keeps it.
+    """
+    if not (entry := manifest.find(url, dst_dir, file_name)):
+        return False
+    if settings.get('revalidate_downloads') and entry['sha256'] and not manifest.verify(url, dst_dir, file_name):
+        print(f"\033[33m[Manifest]:\033[0m {entry['file']} failed the SHA256 check, downloading again")
+        return False
+    if detailed_download == 'on':
+        print(f"\033[32m[Manifest]:\033[0m {entry['file']} already downloaded")
+    eviction.record(Path(dst_dir) / entry['file'])
+    return True
+
+def manual_download(items):
+    """Resolve metadata for every (url, dst_dir, file_name) item, then start all transfers at once."""
+    items = [item for item in items if not _is_downloaded(*item)]
+    civitai_items = [(url, file_name) for url, _, file_name in items if 'civitai' in url]
+    civitai_data = civitai.resolve_many([url for url, _ in civitai_items], [name for _, name in civitai_items])
+    known_sizes = {data.download_url: data.size for data in civitai_data if data and data.size}
+    resolved = iter(civitai_data)
+    if detailed_download == 'on':
+        for endpoint, entry in civitai.latency_stats().items():
+            print(f"\033[34m[CivitAI]:\033[0m {endpoint}: {entry['count']} requests, avg {entry['avg']:.2f}s, max {entry['max']:.2f}s")
+
+    hf_info = hf_file_infos([url for url, _, _ in items if 'huggingface.co' in url], huggingface_token)
+    known_sizes.update({url: size for url, (_, size) in hf_info.items() if size})
+
+    jobs, entries = [], []
+    for url, dst_dir, file_name in items:
+        data = next(resolved) if 'civitai' in url else None
+        file_hash = hf_info.get(url, (None, None))[0]
+        try:
+            item_jobs, entry, source = _prepare_download(url, dst_dir, file_name, data, file_hash)
+        except Exception as e:
+            print(f"\n> Error downloading file: {e}")
+            continue
+        jobs.extend(item_jobs)
+        if entry:
+            entries.append((url, dst_dir, file_name, entry, source))
+
+    # Downloading
+    results, sizes = {}, {}
+    if jobs:
+        sizes = probe_sizes([url for url, _, _, _ in jobs], known_sizes)
+        hashes = {url: file_hash for url, _, _, file_hash in jobs if file_hash}
+        _make_room(sizes)
+        results = m_download(', '.join(f"{url} {dst_dir} {file_name or ''}" for url, dst_dir, file_name, _ in jobs),
+                             log=detailed_download == 'on', sizes=sizes, hashes=hashes) or {}
+
+    finished = [(dst_dir, file_name, file_hash) for url, dst_dir, file_name, file_hash in jobs
+                if file_name and results.get(url)]
+    for dst_dir, file_name, file_hash in finished:
+        if file_hash:
+            model_cache.store(file_hash, Path(dst_dir) / file_name)
+    eviction.record(*(Path(dst_dir) / file_name for dst_dir, file_name, _ in finished))
+
+    for url, dst_dir, file_name, entry, source in entries:
+        target = Path(dst_dir) / entry['file_name']
+        if source is None:    # linked from a cache blob, which was verified when stored
+            manifest.add(url, dst_dir, file_name, **entry, size=target.stat().st_size)
+        elif results.get(source):
+            manifest.add(url, dst_dir, file_name, **entry, size=sizes.get(source))
+    manifest.save()
+
+def _prepare_download(url, dst_dir, file_name=None, data=None, file_hash=None):
+    """
+    Return the (url, dst_dir, file_name, file_hash) jobs still needed for one item,
+    the manifest entry to record once the file is in place and the URL it comes from
+    (None if it was linked from the model cache).
+    """
     clean_url = url
     image_url, image_name = None, None
+    jobs = []
 
     if 'civitai' in url:
-        api = CivitAiAPI(civitai_token)
-        if not (data := api.validate_download(url, file_name)):
-            return
+        if not data:
+            return jobs, None, None
 
-        model_type = data.model_type
         file_name = data.model_name
         clean_url, url = data.clean_url, data.download_url
         image_url, image_name = data.image_url, data.image_name
+        file_hash = data.sha256
 
         # Download preview images
         if image_url and image_name:
-            m_download(f"{image_url} {dst_dir} {image_name}")
+            jobs.append((image_url, dst_dir, image_name, None))
 
     elif 'github' in url or 'huggingface.co' in url:
         if file_name and '.' not in file_name:
             file_name += f".{clean_url.split('.')[-1]}"
+        if 'huggingface.co' in url:
+            file_name = file_name or _extract_filename(url)
 
     # Formatted info output
-    format_output(clean_url, dst_dir, file_name, image_url, image_name)
-
-    # Downloading
-    m_download(f"{url} {dst_dir} {file_name or ''}", log=True)
+    if detailed_download == 'on':
+        format_output(clean_url, dst_dir, file_name, image_url, image_name)
+
+    entry = {
+        'file_name': file_name,
+        'sha256': file_hash,
+        'version_id': data.version_id if data else None,
+        'download_url': clean_url
+    } if file_name else None
+
+    # Reuse a blob from the shared model cache
+    target = Path(dst_dir) / file_name if file_name else None
+    if target and model_cache.link_to(file_hash, target):
+        eviction.record(target)
+        if detailed_download == 'on':
+            print(f"\033[32m[Cache]:\033[0m {file_name} linked from {model_cache.root}")
+        return jobs, entry, None
+
+    jobs.append((url, dst_dir, file_name, file_hash))
+    return jobs, entry, url
 
 ''' SubModels - Added URLs '''
 
@@ -609,32 +727,55 @@ file_urls = [f"{f}.txt" if not f.endswith('.txt') else f for f in custom_file_ur
 prefixed_urls = [f"{p}:{u}" for p, u in zip(PREFIX_MAP, urls_sources) if u for u in u.replace(',', '').split()]
 line += ', '.join(prefixed_urls + [process_file_downloads(file_urls, empowerment_output)])
 
-if detailed_download == 'on':
-    print('\n\n\033[33m# ====== Detailed Download ====== #\n\033[0m')
-    download(line)
-    print('\n\033[33m# =============================== #\n\033[0m')
-else:
-    with capture.capture_output():
-        download(line)
+download_items = collect_download_items(line)
 
-print('\r🏁 Download Complete!' + ' '*15)
+def download_models():
+    if detailed_download == 'on':
+        print('\n\n\033[33m# ====== Detailed Download ====== #\n\033[0m')
+        download(download_items)
+        print('\n\033[33m# =============================== #\n\033[0m')
+    else:
+        print('📦 Downloading models and stuff...')
+        download(download_items)
 
+    print('🏁 Download Complete!')
 
-## Install of Custom extensions
-def _clone_repository(repo, repo_name, extension_dir):
-    """Clones the repository to the specified directory."""
-    repo_name = repo_name or repo.split('/')[-1]
-    command = f"cd {extension_dir} && git clone --depth 1 --recursive {repo} {repo_name} && cd {repo_name} && git fetch"
-    ipySys(command)
 
+## Install of Custom extensions
 extension_type = 'nodes' if UI == 'ComfyUI' else 'extensions'
 
-if extension_repo:
-    print(f"✨ Installing custom {extension_type}...", end='')
-    with capture.capture_output():
-        for repo, repo_name in extension_repo:
-            _clone_repository(repo, repo_name, extension_dir)
-    print(f"\r📦 Installed '{len(extension_repo)}' custom {extension_type}!")
+def install_extensions():
+    print(f"✨ Installing custom {extension_type}...")
+    results = m_clone_repos(extension_repo, extension_dir, log=True)
+    installed = sum(result.status in ('cloned', 'present') for result in results)
+    print(f"📦 Installed '{installed}' custom {extension_type}!")
+
+
+## ======================= STAGES ========================
+# Independent stages run at the same time; `requires` lists the real dependencies
+
+runner = StageRunner()
+runner.add('libraries', install_libraries)
+runner.add('venv', restore_venv, when=not os.path.exists(VENV))
+runner.add('adetailer-cache', unpack_adetailer_cache, when=adetailer_cache_missing)
+runner.add('webui', unpack_webui, when=webui_missing)
+runner.add('update', update_webui, requires=['webui'], when=bool(latest_webui or latest_extensions))
+runner.add('fixes', fix_extensions, requires=['webui', 'update'])
+runner.add('version', switch_version, requires=['webui', 'update'], when=bool(commit_hash))
+runner.add('model-dirs', prepare_model_dirs, requires=['webui'], main_thread=True)
+runner.add('models', download_models, requires=['libraries', 'venv', 'adetailer-cache', 'model-dirs'])    # free-space checks need the unpacked archives
+runner.add('extensions', install_extensions, requires=['webui', 'version'], when=bool(extension_repo))
+
+if not webui_missing:
+    print(f"🔧 Current WebUI: \033[34m{UI}\033[0m")
+    print('🚀 Unpacking is complete. Pass. ⚡')
+
+    timer_env = handle_setup_timer(WEBUI, start_timer)
+    elapsed_time = str(timedelta(seconds=time.time() - timer_env)).split('.')[0]
+    print(f"⌚️ Session duration: \033[33m{elapsed_time}\033[0m")
+
+runner.run()
+runner.print_timings()
 
 
 # === SPECIAL ===
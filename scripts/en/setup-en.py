@@ -361,7 +361,7 @@ async def download_files_async(scr_path, lang, branch):
     files_dict = {
         'CSS': ['main-widgets.css', 'download-result.css', 'auto-cleaner.css'],
         'JS': ['main-widgets.js'],
-        'modules': ['json_utils.py', 'webui_utils.py', 'widget_factory.py', 'TunnelHub.py', 'CivitaiAPI.py', 'Manager.py'],
+        'modules': ['json_utils.py', 'webui_utils.py', 'widget_factory.py', 'TunnelHub.py', 'CivitaiAPI.py', 'download_engine.py', 'model_cache.py', 'model_eviction.py', 'download_manifest.py', 'stage_runner.py', 'file_inventory.py', 'Manager.py'],
         'scripts': {
             'UIs': ['A1111.py', 'ComfyUI.py', 'Forge.py', 'ReForge.py', 'SD-UX.py'],
             lang: [f"widgets-{lang}.py", f"downloading-{lang}.py"],
@@ -29,10 +29,9 @@ HOME = Path.home()
 VENV = HOME / 'venv'
 SCR_PATH = HOME / 'ANXETY'
 SETTINGS_PATH = SCR_PATH / 'settings.json'
+TUNNEL_HISTORY_PATH = SCR_PATH / 'tunnel_history.json'
 
-ENV_NAME = js.read(SETTINGS_PATH, 'ENVIRONMENT.env_name')
-UI = js.read(SETTINGS_PATH, 'WEBUI.current')
-WEBUI = js.read(SETTINGS_PATH, 'WEBUI.webui_path')
+ENV_NAME, UI, WEBUI = js.read_many(SETTINGS_PATH, ['ENVIRONMENT.env_name', 'WEBUI.current', 'WEBUI.webui_path'])
 
 
 BIN = str(VENV / 'bin')
@@ -49,11 +48,8 @@ if PKG not in os.environ['PYTHONPATH']:
 def load_settings(path):
     """Load settings from a JSON file."""
     try:
-        return {
-            **js.read(path, 'ENVIRONMENT'),
-            **js.read(path, 'WIDGETS'),
-            **js.read(path, 'WEBUI')
-        }
+        sections = js.read_many(path, ['ENVIRONMENT', 'WIDGETS', 'WEBUI'], {})
+        return {key: value for section in sections for key, value in section.items()}
     except (json.JSONDecodeError, IOError) as e:
         print(f"Error loading settings: {e}")
         return {}
@@ -67,6 +63,8 @@ locals().update(settings)
 def parse_arguments():
     parser = argparse.ArgumentParser()
     parser.add_argument('-l', '--log', action='store_true', help='Show failed tunnel details')
+    parser.add_argument('-r', '--race', type=int, default=0, metavar='N', help='Use the first N healthy tunnels and cancel the rest')
+    parser.add_argument('--relaunch', action='store_true', help='Restart tunnels after probing instead of keeping them alive')
     return parser.parse_args()
 
 def _trashing():
@@ -88,11 +86,7 @@ def _update_config_paths():
     }
 
     config_file = f"{WEBUI}/config.json"
-    for key, value in config_mapping.items():
-        if js.key_exists(config_file, key):
-            js.update(config_file, key, str(value))
-        else:
-            js.save(config_file, key, str(value))
+    js.save_many(config_file, {key: str(value) for key, value in config_mapping.items()})
 
 def get_launch_command():
     """Construct launch command based on configuration"""
@@ -116,16 +110,27 @@ def get_launch_command():
 
 ## ===================== Tunneling =======================
 
+# Probe history tuning
+PROBE_TIMEOUT = 10          # max seconds to wait for a tunnel URL
+MIN_PROBE_TIMEOUT = 3       # lower bound for the adaptive timeout
+TIMEOUT_FACTOR = 3          # adaptive timeout = average time-to-URL * factor
+DEAD_AFTER_FAILURES = 3     # consecutive failures before a provider is skipped
+DEAD_RETRY_AFTER = 6 * 3600 # seconds before a skipped provider is probed again
+
 class TunnelManager:
     """Class for managing tunnel services"""
 
-    def __init__(self, tunnel_port):
+    def __init__(self, tunnel_port, keep_alive=True, race=0):
         self.tunnel_port = tunnel_port
+        self.keep_alive = keep_alive    # hand healthy probe processes over to TunnelHub
+        self.race = race                # stop probing once this many tunnels are up (0 = wait for all)
         self.tunnels = []
         self.error_reasons = []
         self.public_ip = self._get_public_ip()
         self.checking_queue = asyncio.Queue()
-        self.timeout = 10
+        self.timeout = PROBE_TIMEOUT
+        self.history = js.read(TUNNEL_HISTORY_PATH) or {}
+        self.history_updates = {}
 
     def _get_public_ip(self) -> str:
         """Retrieve and cache public IPv4 address"""
@@ -142,6 +147,55 @@ class TunnelManager:
             print(f"Error getting public IP address: {e}")
             return 'N/A'
 
+    # --- Probe history ---
+
+    def _probe_timeout(self, name) -> float:
+        """
+        Adaptive timeout from the average time-to-URL of past successful probes.
+        After a failure the full timeout is used, so a provider that got slower can recover
+        """
+        stats = self.history.get(name, {})
+        avg_time = stats.get('avg_time')
+        if not avg_time or stats.get('failures_in_row', 0):
+            return self.timeout
+        return min(self.timeout, max(MIN_PROBE_TIMEOUT, avg_time * TIMEOUT_FACTOR))
+
+    def _is_dead(self, name) -> bool:
+        """Provider failed repeatedly and its retry window has not passed yet"""
+        stats = self.history.get(name, {})
+        return (
+            stats.get('failures_in_row', 0) >= DEAD_AFTER_FAILURES
+            and time.time() - stats.get('last_attempt', 0) < DEAD_RETRY_AFTER
+        )
+
+    def _rank(self, name) -> tuple:
+        """Sort key: reliable providers first, then the fastest ones"""
+        stats = self.history.get(name, {})
+        attempts = stats.get('attempts', 0)
+        success_rate = stats.get('successes', 0) / attempts if attempts else 0.5
+        return (-success_rate, stats.get('avg_time') or self.timeout)
+
+    def _record_probe(self, name, success, elapsed):
+        """Update the provider stats; saved in one write by `save_history`"""
+        stats = dict(self.history.get(name, {}))
+        stats['attempts'] = stats.get('attempts', 0) + 1
+        stats['last_attempt'] = time.time()
+
+        if success:
+            stats['successes'] = stats.get('successes', 0) + 1
+            avg_time = None if stats.get('failures_in_row') else stats.get('avg_time')    # restart after failures
+            stats['failures_in_row'] = 0
+            stats['avg_time'] = round(elapsed if avg_time is None else avg_time * 0.7 + elapsed * 0.3, 2)
+        else:
+            stats['failures_in_row'] = stats.get('failures_in_row', 0) + 1
+
+        self.history[name] = self.history_updates[name] = stats
+
+    def save_history(self):
+        if self.history_updates:
+            js.save_many(TUNNEL_HISTORY_PATH, self.history_updates)
+            self.history_updates = {}
+
     async def _print_status(self):
         """Async status printer"""
         print('\033[33mChecking tunnels:\033[0m')
@@ -151,55 +205,79 @@ class TunnelManager:
             self.checking_queue.task_done()
 
     async def _test_tunnel(self, name, config):
-        """Async tunnel testing"""
+        """Async tunnel testing; a healthy process is kept alive for handover when `keep_alive` is set"""
         await self.checking_queue.put(name)
+        loop = asyncio.get_running_loop()
+        process = None
+        handed_over = False
+
         try:
-            process = await asyncio.create_subprocess_exec(
-                *shlex.split(config['command']),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT
+            process = subprocess.Popen(
+                shlex.split(config['command']),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.PIPE
             )
+            fd = process.stdout.fileno()
+            os.set_blocking(fd, False)
 
-            start_time = time.time()
             output = []
-            pattern_found = False
-            check_interval = 0.5
+            buffer = b''
+            found = loop.create_future()
 
-            while time.time() - start_time < self.timeout:
+            def on_output():
+                nonlocal buffer
                 try:
-                    line = await asyncio.wait_for(
-                        process.stdout.readline(),
-                        timeout=check_interval
-                    )
-                    if not line:
-                        continue
-
-                    line = line.decode().strip()
+                    data = os.read(fd, 4096)
+                except BlockingIOError:
+                    return
+                if not data:
+                    loop.remove_reader(fd)
+                    if not found.done():
+                        found.set_result(False)
+                    return
+
+                *lines, buffer = (buffer + data).split(b'\n')
+                for line in lines:
+                    line = line.decode(errors='replace').strip()
                     output.append(line)
+                    if not found.done() and config['pattern'].search(line):
+                        found.set_result(True)
 
-                    if config['pattern'].search(line):
-                        pattern_found = True
-                        break
+            start_time = time.monotonic()
+            loop.add_reader(fd, on_output)
+            try:
+                pattern_found = await asyncio.wait_for(asyncio.shield(found), timeout=self._probe_timeout(name))
+            except asyncio.TimeoutError:
+                pattern_found = False
+            finally:
+                loop.remove_reader(fd)
 
-                except asyncio.TimeoutError:
-                    continue
-
-            if process.returncode is None:
-                try:
-                    process.terminate()
-                    await asyncio.wait_for(process.wait(), timeout=2)
-                except:
-                    pass
+            self._record_probe(name, pattern_found, time.monotonic() - start_time)
 
             if pattern_found:
+                if self.keep_alive:
+                    handed_over = True
+                    return True, {'process': process, 'output': '\n'.join(output)}
                 return True, None
 
             error_msg = '\n'.join(output[-3:]) or 'No output received'
             return False, f"{error_msg[:300]}..."
 
         except Exception as e:
+            self._record_probe(name, False, 0)
             return False, f"Process error: {str(e)}"
 
+        finally:
+            # Also runs when the race cancels this probe
+            if process and not handed_over and process.poll() is None:
+                process.terminate()
+                try:
+                    await asyncio.wait_for(asyncio.to_thread(process.wait), timeout=2)    # keep the other probes running
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await asyncio.to_thread(process.wait)
+
     async def setup_tunnels(self):
         """Async tunnel configuration"""
         services = [
@@ -258,12 +336,32 @@ class TunnelManager:
         # Create status printer task
         printer_task = asyncio.create_task(self._print_status())
 
-        # Run all tests concurrently
-        tasks = []
-        for name, config in services:
-            tasks.append(self._test_tunnel(name, config))
+        # Known-dead providers are skipped until their retry window passes
+        skipped = [(name, config) for name, config in services if self._is_dead(name)]
+        for name, _ in skipped:
+            failures = self.history[name]['failures_in_row']
+            self.error_reasons.append({'name': name, 'reason': f"Skipped: failed {failures} times in a row"})
+        services = sorted((svc for svc in services if svc not in skipped), key=lambda svc: self._rank(svc[0]))
+
+        # Run all tests concurrently; in race mode stop once enough tunnels are up
+        tasks = [asyncio.create_task(self._test_tunnel(name, config)) for name, config in services]
+        if self.race:
+            healthy = 0
+            for future in asyncio.as_completed(tasks):
+                success, _ = await future
+                healthy += success
+                if healthy >= self.race:
+                    break
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        else:
+            await asyncio.gather(*tasks)
 
-        results = await asyncio.gather(*tasks)
+        results = [
+            (False, f"Cancelled: {self.race} healthy tunnel(s) already up") if task.cancelled() else task.result()
+            for task in tasks
+        ]
 
         # Cancel status printer
         printer_task.cancel()
@@ -272,16 +370,18 @@ class TunnelManager:
         except asyncio.CancelledError:
             pass
 
+        self.save_history()
+
         # Process results
-        for (name, config), (success, error) in zip(services, results):
+        for (name, config), (success, detail) in zip(services, results):
             if success:
-                self.tunnels.append({**config, 'name': name})
+                self.tunnels.append({**config, **(detail or {}), 'name': name})    # detail: alive process + its output
             else:
-                self.error_reasons.append({'name': name, 'reason': error})
+                self.error_reasons.append({'name': name, 'reason': detail})
 
         return (
             self.tunnels,
-            len(services),
+            len(services) + len(skipped),
             len(self.tunnels),
             len(self.error_reasons)
         )
@@ -300,7 +400,7 @@ if __name__ == '__main__':
 
     # Initialize tunnel manager and services
     tunnel_port = 8188 if UI == 'ComfyUI' else 7860
-    tunnel_mgr = TunnelManager(tunnel_port)
+    tunnel_mgr = TunnelManager(tunnel_port, keep_alive=not args.relaunch, race=max(args.race, 0))
 
     # Run async setup
     loop = asyncio.new_event_loop()
@@ -312,7 +412,10 @@ if __name__ == '__main__':
     tunnelingService.logger.setLevel(logging.DEBUG)
 
     for tunnel in tunnels:
-        tunnelingService.add_tunnel(**tunnel)
+        if tunnel.get('process'):
+            tunnelingService.adopt_tunnel(**tunnel)
+        else:
+            tunnelingService.add_tunnel(**tunnel)
 
     clear_output(wait=True)
 
@@ -89,6 +89,7 @@ latest_webui_widget = factory.create_checkbox('Обновить WebUI', True)
 latest_extensions_widget = factory.create_checkbox('Обновить Расширения', True)
 check_custom_nodes_deps_widget = factory.create_checkbox('Чекать зависимости Custom-Nodes', True)
 change_webui_widget = factory.create_dropdown(list(webui_selection.keys()), 'WebUI:', 'A1111', layout={'width': 'auto'})
+revalidate_downloads_widget = factory.create_checkbox('Перепроверить Загрузки', False)
 detailed_download_widget = factory.create_dropdown(['off', 'on'], 'Подробная Загрузка:', 'off', layout={'width': 'auto'})
 choose_changes_widget = factory.create_hbox(
     [
@@ -96,6 +97,7 @@ choose_changes_widget = factory.create_hbox(
         latest_extensions_widget,
         check_custom_nodes_deps_widget,   # Only ComfyUI
         change_webui_widget,
+        revalidate_downloads_widget,
         detailed_download_widget
     ],
     layout={'justify_content': 'space-between'}
@@ -323,7 +325,7 @@ factory.connect_widgets([(empowerment_widget, 'value')], update_empowerment)
 
 SETTINGS_KEYS = [
       'XL_models', 'model', 'model_num', 'inpainting_model', 'vae', 'vae_num', 'lora', 'lora_num',
-      'latest_webui', 'latest_extensions', 'check_custom_nodes_deps', 'change_webui', 'detailed_download',
+      'latest_webui', 'latest_extensions', 'check_custom_nodes_deps', 'change_webui', 'detailed_download', 'revalidate_downloads',
       'controlnet', 'controlnet_num', 'commit_hash',
       'civitai_token', 'huggingface_token', 'zrok_token', 'ngrok_token', 'commandline_arguments', 'theme_accent',
       # CustomDL